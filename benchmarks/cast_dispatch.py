@@ -0,0 +1,108 @@
+"""
+Cast of mixed item, edge and event payloads by the vendored client.
+
+    python benchmarks/cast_dispatch.py [count]
+
+Compares the previous if/elif cast (copied below as the baseline) with the table driven
+`Aquarium.cast` and `Aquarium.cast_many`, on `count` (default 200k) payloads, best of 5.
+The dispatch only runs replace the entity classes with a no-op, to measure the lookup alone.
+"""
+import sys
+import random
+
+from support import best_of, use_vendored_client
+
+use_vendored_client()
+from vendors.aquarium import Aquarium  # noqa: E402
+
+ENTITY_CLASSES = (
+    "item", "project", "playlist", "user", "template", "usergroup",
+    "asset", "shot", "task", "organisation", "edge", "event",
+)
+
+
+def baseline_cast(aq, data={}):
+    """`Aquarium.cast` before the dispatch tables."""
+    value = data
+    if data and "_id" in data.keys():
+        id = data.get("_id")
+        cls = None
+        if id.split("/")[0] == "items":
+            type = data.get("type")
+            if type == "Project":
+                cls = aq.project
+            elif type == "Playlist":
+                cls = aq.playlist
+            elif type == "User":
+                cls = aq.user
+            elif type == "Template":
+                cls = aq.template
+            elif type == "Usergroup":
+                cls = aq.usergroup
+            elif type == "Asset":
+                cls = aq.asset
+            elif type == "Shot":
+                cls = aq.shot
+            elif type == "Task":
+                cls = aq.task
+            elif type == "Organisation":
+                cls = aq.organisation
+            else:
+                cls = aq.item
+        elif id.split("/")[0] == "connections":
+            cls = aq.edge
+        elif id.split("/")[0] == "events":
+            cls = aq.event
+
+        if cls is not None:
+            value = cls(data=data)
+    return value
+
+
+def make_payload(index: int) -> dict:
+    draw = random.random()
+    if draw < 0.6:
+        item_type = random.choice(["Shot", "Task", "Asset", "Sequence", "Episode"])
+        return {"_id": f"items/{index}", "_key": str(index), "type": item_type, "data": {"name": "name"}}
+    if draw < 0.9:
+        return {
+            "_id": f"connections/{index}", "_key": str(index), "type": "Child",
+            "_from": "items/1", "_to": "items/2", "data": {"weight": 1},
+        }
+    return {"_id": f"events/{index}", "_key": str(index), "type": "item", "topic": "item.updated.Shot", "data": {"item": {}}}
+
+
+def no_op(data=None):
+    return data
+
+
+def get_dispatch_client() -> Aquarium:
+    """Client whose entity classes don't build anything."""
+    aq = Aquarium()
+    for name in ENTITY_CLASSES:
+        setattr(aq, name, no_op)
+    aq.item_types = {item_type: no_op for item_type in aq.item_types}
+    aq.collection_types = {collection: no_op for collection in aq.collection_types}
+    return aq
+
+
+def run(label: str, aq: Aquarium, payloads: list):
+    results = (
+        ("if/elif (baseline)", lambda: [baseline_cast(aq, data) for data in payloads]),
+        ("cast", lambda: [aq.cast(data) for data in payloads]),
+        ("cast_many", lambda: aq.cast_many(payloads)),
+    )
+    for name, func in results:
+        print(f"{label:<14} {name:<20} {best_of(func, repeat=5):.3f} s")
+
+
+def main(count: int):
+    random.seed(1)
+    payloads = [make_payload(index) for index in range(count)]
+    print(f"{count} payloads, best of 5")
+    run("dispatch only", get_dispatch_client(), payloads)
+    run("full (lazy)", Aquarium(entity_mode="lazy"), payloads)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
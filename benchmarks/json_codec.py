@@ -0,0 +1,61 @@
+"""
+Decode and encode time of the JSON codecs of the vendored client.
+
+    python benchmarks/json_codec.py [count]
+
+Decodes and encodes a traverse response of `count` (default 50k) shots with each installed
+codec, best of 5, and decodes it with `requests.Response.json`, the previous decoder.
+"""
+import sys
+import json
+
+import requests
+
+from support import best_of, use_vendored_client
+
+use_vendored_client()
+from vendors.aquarium.codec import get_codec  # noqa: E402
+
+
+def make_item(index: int) -> dict:
+    return {
+        "_id": f"items/{index}",
+        "_key": str(index),
+        "_rev": f"_rev{index}",
+        "type": "Shot",
+        "data": {
+            "name": f"sh{index:05d}",
+            "frameIn": 1001,
+            "frameOut": 1100 + index % 50,
+            "description": "Lorem ipsum dolor sit amet é" * 3,
+            "tags": ["a", "b"],
+            "completion": 0.5,
+        },
+    }
+
+
+def response_json(raw: bytes):
+    response = requests.models.Response()
+    response._content = raw
+    response.headers["content-type"] = "application/json"
+    return response.json()
+
+
+def main(count: int):
+    items = [make_item(index) for index in range(count)]
+    raw = json.dumps(items).encode()
+    print(f"{count} items, {len(raw) / 2 ** 20:.1f} MiB, best of 5")
+    print(f"{'requests':<8} decode {best_of(lambda: response_json(raw), repeat=5) * 1e3:7.1f} ms")
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        decode = best_of(lambda: codec.loads(raw), repeat=5)
+        encode = best_of(lambda: codec.dumps(items), repeat=5)
+        print(f"{name:<8} decode {decode * 1e3:7.1f} ms  encode {encode * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
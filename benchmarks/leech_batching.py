@@ -0,0 +1,109 @@
+"""
+Throughput of the leecher sending events to AYON one by one or in batches.
+
+    python benchmarks/leech_batching.py [count]
+
+Sends `count` (default 5000) events through the services `EventDispatcher` with 4 workers, to
+a local stand-in of AYON answering in 5 ms per request plus 0.5 ms per stored event. The
+previous leecher dispatched one AYON event per Aquarium event.
+"""
+import sys
+import json
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from support import use_service
+
+use_service("leecher")
+from aquarium_common import EventDispatcher  # noqa: E402
+
+REQUEST_DELAY = 0.005
+EVENT_DELAY = 0.0005
+
+
+class AyonStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stored = 0
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        count = len(body["events"]) if "events" in body else 1
+        time.sleep(REQUEST_DELAY + EVENT_DELAY * count)
+        AyonStandIn.stored += count
+
+        content = json.dumps({"dispatched": count, "duplicates": 0}).encode()
+        self.send_response(200)
+        self.send_header("content-length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class Event:
+    topic = "item.updated.Shot"
+    data = {}
+
+    def __init__(self, index: int):
+        self._key = str(index)
+        self.emittedFrom = f"items/{index % 200}"
+
+    def to_dict(self) -> dict:
+        return {"_key": self._key, "topic": self.topic, "data": {"name": "x" * 300}}
+
+
+class Sender:
+    """One requests session per worker, like ayon_api."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def send(self, event):
+        payload = {"topic": "aquarium.leech", "hash": event._key, "payload": event.to_dict()}
+        self.session.post(f"{self.url}/events", json=payload).raise_for_status()
+
+    def send_batch(self, events: list):
+        batch = [{"hash": event._key, "payload": event.to_dict()} for event in events]
+        self.session.post(f"{self.url}/events/leech", json={"events": batch}).raise_for_status()
+
+
+def main(count: int):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AyonStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sender = Sender(f"http://127.0.0.1:{server.server_port}")
+
+    print(f"{count} events, 4 workers")
+    for name, send, batch_size in (
+        ("one request per event", sender.send, 1),
+        ("batches of 50 / 200 ms", sender.send_batch, 50),
+    ):
+        AyonStandIn.stored = 0
+        dispatcher = EventDispatcher(send, workers=4, queue_size=1000, batch_size=batch_size, batch_interval=0.2)
+        dispatcher.start()
+        started = time.perf_counter()
+        for index in range(count):
+            dispatcher.submit(Event(index))
+        dispatcher.stop()
+        elapsed = time.perf_counter() - started
+        print(f"{name:<23} {AyonStandIn.stored} stored  {elapsed:6.2f} s  {count / elapsed:6.0f} events/s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,139 @@
+"""
+Throughput of the processor by number of workers, and its AYON calls per processed event.
+
+    python benchmarks/processor_workers.py [count]
+
+Processes `count` (default 2000) leeched events of 20 projects with a stand-in of AYON
+answering in 2 ms, and handlers taking 10 ms. Only `aquarium.leech` has jobs to enroll, like
+a running processor without any full sync. The calls are the enrollments, the source events
+fetched and the job status requests of the processor, the handlers don't call the stand-in.
+"""
+import sys
+import time
+import threading
+from collections import Counter, deque
+from types import SimpleNamespace
+
+from support import use_service
+
+use_service("processor")
+import processor.jobs  # noqa: E402
+import processor.pairing  # noqa: E402
+import processor.processor  # noqa: E402
+
+LATENCY = 0.002
+HANDLER_TIME = 0.01
+PROJECTS = 20
+
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+
+class AyonStandIn:
+    """AYON events and jobs, a sequential enrollment waits for the unfinished jobs."""
+
+    def __init__(self, count: int):
+        self.calls = Counter()
+        self.finished = 0
+        self._pending = deque(range(count))
+        self._unfinished = set()
+        self._lock = threading.Lock()
+
+    def call(self, name: str):
+        time.sleep(LATENCY)
+        with self._lock:
+            self.calls[name] += 1
+
+    def enroll_event_job(self, source_topic, target_topic, sender, description, sequential=False, **kwargs):
+        self.call("enroll")
+        with self._lock:
+            if source_topic != "aquarium.leech" or not self._pending:
+                return None
+            if sequential and self._unfinished:
+                return None
+            index = self._pending.popleft()
+            self._unfinished.add(f"job{index}")
+        return {"id": f"job{index}", "dependsOn": f"event{index}"}
+
+    def get_event(self, event_id):
+        self.call("get_event")
+        index = int(event_id[len("event"):])
+        return {
+            "id": event_id,
+            "topic": "aquarium.leech",
+            "project": None,
+            "description": f"Received item.updated.Shot #{index}",
+            "payload": {
+                "topic": "item.updated.Shot",
+                "aquariumProjectKey": f"project{index % PROJECTS}",
+                "data": {"item": {"_key": f"item{index}"}},
+            },
+        }
+
+    def post(self, url, **kwargs):
+        self.call("post")
+        with self._lock:
+            for job in kwargs.get("jobs", []):
+                if job["status"] in ("finished", "failed") and job["id"] in self._unfinished:
+                    self._unfinished.discard(job["id"])
+                    self.finished += 1
+        return Response({"missing": []})
+
+    def get(self, url, **kwargs):
+        return Response([])
+
+
+class Processor(processor.processor.AquariumProcessor):
+    def process_event(self, rawEvent: dict, job):
+        # Handlers read their item from Aquarium and write it to AYON
+        time.sleep(HANDLER_TIME)
+
+
+def use_stand_in(ayon: AyonStandIn, workers: int):
+    settings = {"services": {"processor": {"workers": workers, "coalesce_window": 1}}}
+    module = processor.processor
+    module.get_service_addon_name = lambda: "aquarium"
+    module.get_service_addon_version = lambda: "0.0.0"
+    module.get_service_addon_settings = lambda: settings
+    module.enroll_event_job = ayon.enroll_event_job
+    module.get_event = ayon.get_event
+    processor.jobs.post = ayon.post
+    processor.pairing.get = ayon.get
+
+
+def run(count: int, workers: int):
+    ayon = AyonStandIn(count)
+    use_stand_in(ayon, workers)
+    instance = Processor(SimpleNamespace(aq=None, IGNORE_TOPICS={}))
+    thread = threading.Thread(target=instance.wait, daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    while ayon.finished < count:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    instance.stop()
+    thread.join()
+
+    calls = sum(ayon.calls.values())
+    print(
+        f"workers {workers:<3} {count / elapsed:6.0f} events/s  "
+        f"{calls / count:5.2f} calls/event  "
+        f"(enroll {ayon.calls['enroll'] / count:.2f}, get_event {ayon.calls['get_event'] / count:.2f}, "
+        f"statuses {ayon.calls['post'] / count:.2f})"
+    )
+
+
+def main(count: int):
+    print(f"{count} events of {PROJECTS} projects")
+    for workers in (1, 2, 4, 8, 16):
+        # A single worker enrolls one job at a time, waiting for the previous one
+        run(count // 10 if workers == 1 else count, workers)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
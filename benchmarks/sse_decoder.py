@@ -0,0 +1,78 @@
+"""
+Decoding of the Aquarium events stream by the vendored client.
+
+    python benchmarks/sse_decoder.py [count]
+
+Replays a stream of `count` (default 100k) events in 1 KiB chunks, with a 200 KB event every
+1000, through `Events` and through the previous str buffer (copied below as the baseline).
+Both parse the events with `Event.parse` and the stdlib JSON codec, so only the buffering differs.
+"""
+import re
+import sys
+import json
+import time
+import codecs
+
+from support import use_vendored_client
+
+use_vendored_client()
+from vendors.aquarium import Aquarium  # noqa: E402
+from vendors.aquarium.events import Event, Events  # noqa: E402
+
+end_of_field = re.compile(r"\r\n\r\n|\r\r|\n\n")
+
+
+def make_stream(count: int) -> bytes:
+    parts = []
+    for index in range(count):
+        size = 200000 if index % 1000 == 0 else 200
+        data = {
+            "_id": f"events/{index}",
+            "_key": str(index),
+            "topic": "item.updated.Shot",
+            "data": {"item": {"_key": str(index), "data": {"name": "x" * size}}},
+        }
+        parts.append(f"id: {index}\ndata: {json.dumps(data)}\n\n")
+    return "".join(parts).encode()
+
+
+def baseline(aq: Aquarium, chunks: list) -> int:
+    """`Events.__next__` before the `SSEDecoder`."""
+    buf = ""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    count = 0
+    for chunk in chunks:
+        buf += decoder.decode(chunk)
+        while re.search(end_of_field, buf) is not None:
+            event_string, buf = re.split(end_of_field, buf, maxsplit=1)
+            if Event.parse(event_string, aq) is not None:
+                count += 1
+    return count
+
+
+def decoder(aq: Aquarium, chunks: list) -> int:
+    events = Events(parent=aq, wait=0)
+    events.listening = True
+    events.stream_iterator = iter(chunks)
+
+    # The end of the stream reconnects, stop there instead
+    def stop():
+        events.listening = False
+
+    events.listen = stop
+    return sum(1 for _ in events)
+
+
+def main(count: int):
+    aq = Aquarium(json_codec="json")
+    stream = make_stream(count)
+    chunks = [stream[offset:offset + 1024] for offset in range(0, len(stream), 1024)]
+    print(f"{count} events, {len(stream) / 2 ** 20:.1f} MiB in {len(chunks)} chunks")
+    for name, func in (("str buffer (baseline)", baseline), ("SSEDecoder", decoder)):
+        started = time.perf_counter()
+        decoded = func(aq, chunks)
+        print(f"{name:<22} {decoded} events  {time.perf_counter() - started:6.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
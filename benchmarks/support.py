@@ -0,0 +1,45 @@
+""" Helpers shared by the benchmarks, to import the addon code from the repository """
+import sys
+import time
+import importlib.util
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def use_vendored_client():
+    """Import the Aquarium client vendored by the server addon as `vendors.aquarium`."""
+    path = str(ROOT / "server")
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def use_service(name: str):
+    """
+    Import a service package (leecher or processor).
+    `services/common` is imported as `aquarium_common`, as copied by the services Makefile.
+    """
+    path = str(ROOT / "services" / name)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+    if "aquarium_common" not in sys.modules:
+        common = ROOT / "services" / "common"
+        spec = importlib.util.spec_from_file_location(
+            "aquarium_common",
+            common / "__init__.py",
+            submodule_search_locations=[str(common)],
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["aquarium_common"] = module
+        spec.loader.exec_module(module)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Best wall time of `repeat` calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
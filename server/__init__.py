@@ -27,10 +27,13 @@ from .routes.anatomy import (
     get_aquarium_project_anatomy, ProjectAttribModel
 )
 
-from .routes.events import get_event
+from .routes.events import (
+    get_event,
+    leech_events, LeechEventsRequest, LeechEventsResponse,
+    update_jobs_status, JobsStatusRequest, JobsStatusResponse)
 
 
-from .vendors.aquarium import Aquarium, DEFAULT_STATUSES
+from .vendors.aquarium import AsyncAquarium, QueryCache, DEFAULT_STATUSES
 
 try:
     from .version import __version__ # type: ignore
@@ -60,7 +63,10 @@ class AquariumAddon(BaseServerAddon):
     }
 
     bot_key: str
-    aq: Aquarium = Aquarium()
+    aq: AsyncAquarium = AsyncAquarium(max_connections=20, timeout=(10, 300))
+    # Only anatomy queries are cached: the processor refreshes them on project updates, other
+    # changes (properties, templates) aren't seen by the server so they expire quickly
+    anatomy_cache: QueryCache = QueryCache(ttl=30, maxsize=256)
     aq_default_statuses = list(DEFAULT_STATUSES.values())
 
     # frontend_scopes: dict[str, dict[str, str]] = {"project": {"sidebar": "hierarchy"}}
@@ -77,6 +83,8 @@ class AquariumAddon(BaseServerAddon):
         self.add_endpoint("/projects/{project_name}/sync/folder", self.POST_projects_sync_folder, method="POST")
         self.add_endpoint("/projects/{project_name}/sync/task", self.POST_projects_sync_task, method="POST")
         self.add_endpoint("/projects/{project_name}/anatomy/attributes", self.GET_anatomy_attributes, method="GET")
+        self.add_endpoint("/events/leech", self.POST_events_leech, method="POST")
+        self.add_endpoint("/events/jobs", self.POST_events_jobs, method="POST")
         self.add_endpoint("/events/{event_id}", self.GET_event, method="GET")
 
         logging.info("Aquarium addon initialized.")
@@ -88,7 +96,10 @@ class AquariumAddon(BaseServerAddon):
     """
 
     # GET /projects/pair
-    async def GET_projects_paired(self) -> list[ProjectPaired]:
+    async def GET_projects_paired(self, paired: bool = False) -> list[ProjectPaired]:
+        if paired:
+            return await get_paired_projects(self, paired=True)
+
         await self.connect_aquarium()
         return await get_paired_projects(self)
 
@@ -142,9 +153,9 @@ class AquariumAddon(BaseServerAddon):
         return await sync_task(self, project_name, user, request)
 
     # GET /projects/{project_name}/anatomy/attributes
-    async def GET_anatomy_attributes(self, project_name: ProjectName) -> ProjectAttribModel:
+    async def GET_anatomy_attributes(self, project_name: ProjectName, refresh: bool = False) -> ProjectAttribModel:
         await self.connect_aquarium()
-        anatomy = await get_aquarium_project_anatomy(self, project_name)
+        anatomy = await get_aquarium_project_anatomy(self, project_name, refresh=refresh)
         return anatomy.attributes
 
     # GET /events/{event_id}
@@ -154,6 +165,20 @@ class AquariumAddon(BaseServerAddon):
 
         return await get_event(self, user, event_id)
 
+    # POST /events/leech
+    async def POST_events_leech(self, user: CurrentUser, request: LeechEventsRequest) -> LeechEventsResponse:
+        if not user.is_service and not user.is_manager:
+            raise ForbiddenException("Only services can leech Aquarium events")
+
+        return await leech_events(self, user, request)
+
+    # POST /events/jobs
+    async def POST_events_jobs(self, user: CurrentUser, request: JobsStatusRequest) -> JobsStatusResponse:
+        if not user.is_service and not user.is_manager:
+            raise ForbiddenException("Only services can update Aquarium jobs")
+
+        return await update_jobs_status(self, user, request)
+
 
     async def setup(self):
         pass
@@ -204,6 +229,6 @@ class AquariumAddon(BaseServerAddon):
 
         self.aq.api_url = settings.url
         self.aq.domain = settings.domain
-        self.aq.bot(actual_bot_key).signin(actual_bot_secret)
+        await self.aq.bot(actual_bot_key).signin(actual_bot_secret)
 
         self.bot_key = actual_bot_key
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 from ayon_server.entities.project import ProjectEntity
 from ayon_server.settings.anatomy import Anatomy, ProjectAttribModel # Keep this import for server controllers
@@ -9,10 +9,25 @@ from .utils import parse_attrib, parse_statuses, parse_task_types, get_primary_a
 if TYPE_CHECKING:
     from .. import AquariumAddon
 
-async def get_aquarium_project_anatomy(addon: "AquariumAddon", project_name: str, aquarium_project_key: str | None = None) -> Anatomy:
+async def cached_query(addon: "AquariumAddon", aquarium_project_key: str, endpoint: str, meshql: str, aliases: dict, fetch: Callable[[], Awaitable]):
+    """
+        Get the result of an anatomy query from the cache, or fetch it and cache it.
+        Results are invalidated by the project key.
+    """
+    key = addon.anatomy_cache.make_key(endpoint, meshql, aliases)
+    found, result = addon.anatomy_cache.get(key)
+    if found:
+        return result
+
+    result = await fetch()
+    addon.anatomy_cache.set(key, result, tags=[aquarium_project_key])
+    return result
+
+async def get_aquarium_project_anatomy(addon: "AquariumAddon", project_name: str, aquarium_project_key: str | None = None, refresh: bool = False) -> Anatomy:
     """
         Get the anatomy of a project from Aquarium.
         If the aquarium_project_key is not provided, it will be fetched from the database.
+        Set refresh to ignore the cached Aquarium queries of the project.
     """
     if aquarium_project_key is None:
         async for res in Postgres.iterate(
@@ -21,6 +36,9 @@ async def get_aquarium_project_anatomy(addon: "AquariumAddon", project_name: str
         ):
             aquarium_project_key = res[0]
 
+    if refresh:
+        addon.anatomy_cache.invalidate(aquarium_project_key)
+
     projectQuery = "# 0,1 item._key == @projectKey VIEW $view"
     projectAliases = {
         "projectKey": aquarium_project_key,
@@ -29,7 +47,8 @@ async def get_aquarium_project_anatomy(addon: "AquariumAddon", project_name: str
             "properties": "# -($Child)> $Properties VIEW item.data"
         }
     }
-    aqProjects = addon.aq.query(meshql=projectQuery, aliases=projectAliases)
+    aqProjects = await cached_query(addon, aquarium_project_key, "query", projectQuery, projectAliases,
+                                    lambda: addon.aq.query(meshql=projectQuery, aliases=projectAliases))
 
     if len(aqProjects) == 0:
         raise Exception("Project not found on Aquarium")
@@ -46,7 +65,8 @@ async def get_aquarium_project_anatomy(addon: "AquariumAddon", project_name: str
             "icon": "item.data.icon",
         }
     }
-    aqTemplateTasks = addon.aq.project(aquarium_project_key).traverse(meshql=templateTasksQuery, aliases=templateTasksAliases)
+    aqTemplateTasks = await cached_query(addon, aquarium_project_key, f"items/{aquarium_project_key}/traverse", templateTasksQuery, templateTasksAliases,
+                                         lambda: addon.aq.project(aquarium_project_key).traverse(meshql=templateTasksQuery, aliases=templateTasksAliases))
     task_types = await parse_task_types(addon, aqTemplateTasks)
 
     anatomy_preset = await get_primary_anatomy_preset()
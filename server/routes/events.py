@@ -3,13 +3,43 @@ from nxtools import logging
 
 from ayon_server.lib.postgres import Postgres
 from ayon_server.entities import UserEntity
-from ayon_server.exceptions import NotFoundException
+from ayon_server.events import dispatch_event, update_event
+from ayon_server.exceptions import NotFoundException, ConstraintViolationException
+from ayon_server.types import Field, OPModel
 
 from .sync import syncTopic
 
 if TYPE_CHECKING:
     from .. import AquariumAddon
 
+leechTopic = "aquarium.leech"
+
+class LeechEvent(OPModel):
+    hash: str = Field(..., title="Event hash, the Aquarium event _key")
+    description: str = Field("", title="Event description")
+    payload: dict = Field(default_factory=dict, title="Aquarium event")
+
+class LeechEventsRequest(OPModel):
+    sender: str | None = Field(None, title="Service sending the events")
+    events: list[LeechEvent] = Field(..., title="Aquarium events, in the order they were received")
+
+class LeechEventsResponse(OPModel):
+    dispatched: int = Field(..., title="Number of events stored")
+    duplicates: int = Field(..., title="Number of events already stored")
+
+class JobStatus(OPModel):
+    id: str = Field(..., title="Job event id")
+    status: str = Field(..., title="Job status")
+    description: str | None = Field(None, title="Job description")
+
+class JobsStatusRequest(OPModel):
+    sender: str | None = Field(None, title="Service updating the jobs")
+    jobs: list[JobStatus] = Field(..., title="Job status transitions, in order")
+
+class JobsStatusResponse(OPModel):
+    updated: int = Field(..., title="Number of jobs updated")
+    missing: list[str] = Field(default_factory=list, title="Jobs not found")
+
 async def get_event(addon: "AquariumAddon", user: "UserEntity", event_id: str) -> dict:
     """
         Get event by its id and the status of the event it depends on
@@ -37,4 +67,49 @@ async def get_event(addon: "AquariumAddon", user: "UserEntity", event_id: str) -
     if not event:
         raise NotFoundException("Event not found")
 
-    return event
\ No newline at end of file
+    return event
+async def leech_events(addon: "AquariumAddon", user: "UserEntity", request: LeechEventsRequest) -> LeechEventsResponse:
+    """
+        Store a batch of Aquarium events received by the leecher, in order.
+        Events already stored (same hash) are skipped, so a batch can be sent again safely.
+    """
+    dispatched = 0
+    duplicates = 0
+    for event in request.events:
+        try:
+            await dispatch_event(
+                leechTopic,
+                hash=event.hash,
+                sender=request.sender,
+                description=event.description,
+                user=user.name,
+                payload=event.payload,
+            )
+            dispatched += 1
+        except ConstraintViolationException:
+            duplicates += 1
+
+    logging.debug(f"Leeched {dispatched} events, {duplicates} duplicates")
+    return LeechEventsResponse(dispatched=dispatched, duplicates=duplicates)
+
+async def update_jobs_status(addon: "AquariumAddon", user: "UserEntity", request: JobsStatusRequest) -> JobsStatusResponse:
+    """
+        Update the status of a batch of processor jobs in a single request.
+    """
+    updated = 0
+    missing = []
+    for job in request.jobs:
+        try:
+            await update_event(
+                job.id,
+                sender=request.sender,
+                user=user.name,
+                status=job.status,
+                description=job.description,
+            )
+            updated += 1
+        except NotFoundException:
+            missing.append(job.id)
+
+    logging.debug(f"Updated {updated} jobs status, {len(missing)} missing")
+    return JobsStatusResponse(updated=updated, missing=missing)
@@ -17,15 +17,18 @@ from .utils import ensure_ayon_project_not_exists, create_short_name, set_aquari
 if TYPE_CHECKING:
     from .. import AquariumAddon
 
+pairingTopic = "aquarium.pairing"
+
 class ProjectPaired(OPModel):
     aquariumProjectKey: str | None = Field(..., title="Aquarium project _key")
     aquariumProjectName: str | None = Field(..., title="Aquarium project name")
     aquariumProjectCode: str | None = Field(..., title="Aquarium project code")
     ayonProjectName: str | None = Field(..., title="Ayon project name")
 
-async def get_paired_projects(addon: "AquariumAddon") -> list[ProjectPaired]:
+async def get_paired_projects(addon: "AquariumAddon", paired: bool = False) -> list[ProjectPaired]:
     """
         Get all the projects paired between Aquarium and Ayon.
+        With `paired`, only the paired projects are listed, without requesting Aquarium.
     """
     ayon_projects: list[dict] = []
     paired_projects: list[ProjectPaired] = []
@@ -42,7 +45,19 @@ async def get_paired_projects(addon: "AquariumAddon") -> list[ProjectPaired]:
     ):
         ayon_projects.append({"name": res["name"], "aquariumProjectKey": res.get("aquariumprojectkey", None)})
 
-    aqProjects = addon.aq.project.get_all()
+    if paired:
+        return [
+            ProjectPaired(
+                aquariumProjectKey=project["aquariumProjectKey"],
+                aquariumProjectName=None,
+                aquariumProjectCode=None,
+                ayonProjectName=project["name"],
+            )
+            for project in ayon_projects
+            if project["aquariumProjectKey"]
+        ]
+
+    aqProjects = await addon.aq.project.get_all()
     for project in aqProjects:
         aquariumProjectKey: str = project._key
         paired_projects.append(
@@ -68,6 +83,23 @@ async def get_paired_projects(addon: "AquariumAddon") -> list[ProjectPaired]:
 
     return paired_projects
 
+async def dispatch_pairing_event(user: "UserEntity", project_name: str, aquarium_project_key: str, paired: bool):
+    """
+        Notify the services that a project was paired or unpaired, so they refresh their pairing cache.
+    """
+    action = "Paired" if paired else "Unpaired"
+    await dispatch_event(
+        pairingTopic,
+        description=f"{action} project {project_name} with Aquarium",
+        project=project_name,
+        user=user.name,
+        payload={
+            "aquariumProjectKey": aquarium_project_key,
+            "ayonProjectName": project_name,
+            "paired": paired,
+        },
+    )
+
 class ProjectsPairRequest(OPModel):
     aquariumProjectKey: str = Field(..., title="Aquarium project _key")
     ayonProjectName: str = Field(
@@ -91,7 +123,8 @@ async def pair_ayon_project(addon: "AquariumAddon", user: "UserEntity", request:
         raise AlreadyPairedException(f"Project {request.ayonProjectName} is already paired with an Aquarium project. Unpair the project first.")
 
     await set_aquariumKey_on_project(request.ayonProjectName, request.aquariumProjectKey)
-    addon.aq.project(request.aquariumProjectKey).update_data(data={"ayonProjectName": request.ayonProjectName})
+    await addon.aq.project(request.aquariumProjectKey).update_data(data={"ayonProjectName": request.ayonProjectName})
+    await dispatch_pairing_event(user, request.ayonProjectName, request.aquariumProjectKey, paired=True)
 
     return await trigger_sync_project(
         addon,
@@ -139,7 +172,8 @@ async def create_ayon_project(addon: "AquariumAddon", user: "UserEntity", reques
         raise Exception(f"Failed to create project: {e}")
 
     await set_aquariumKey_on_project(request.ayonProjectName, request.aquariumProjectKey)
-    addon.aq.project(request.aquariumProjectKey).update_data(data={"ayonProjectName": request.ayonProjectName})
+    await addon.aq.project(request.aquariumProjectKey).update_data(data={"ayonProjectName": request.ayonProjectName})
+    await dispatch_pairing_event(user, request.ayonProjectName, request.aquariumProjectKey, paired=True)
 
     return await trigger_sync_project(
         addon,
@@ -177,7 +211,8 @@ async def unpair_project(addon: "AquariumAddon", user: "UserEntity", project_nam
     project = await ProjectEntity.load(project_name)
     aquariumProjectKey = project.data['aquariumProjectKey']
 
-    addon.aq.project(aquariumProjectKey).update_data(data={"ayonProjectName": None})
+    await addon.aq.project(aquariumProjectKey).update_data(data={"ayonProjectName": None})
 
     project.data['aquariumProjectKey'] = None
     await project.save()
+    await dispatch_pairing_event(user, project_name, aquariumProjectKey, paired=False)
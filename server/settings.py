@@ -5,6 +5,96 @@ from ayon_server.settings import BaseSettingsModel
 from ayon_server.settings.enum import secrets_enum
 from ayon_server.settings.anatomy.statuses import State
 
+class LeecherSettings(BaseSettingsModel):
+    """
+    Leecher listens to Aquarium events and stores them on AYON.
+    Events are sent to AYON by a pool of workers, in order for a same item.
+    """
+
+    workers: int = Field(
+        4,
+        ge=1,
+        title="Workers",
+        description="Number of threads sending Aquarium events to AYON",
+    )
+    queue_size: int = Field(
+        1000,
+        ge=1,
+        title="Queue size",
+        description="Maximum number of events waiting per worker before the event stream is paused",
+    )
+    batch_size: int = Field(
+        50,
+        ge=1,
+        title="Batch size",
+        description="Maximum number of events sent to AYON in a single request. Set to 1 to send events one by one",
+    )
+    batch_interval_ms: int = Field(
+        200,
+        ge=0,
+        title="Batch interval (ms)",
+        description="Maximum time to wait for a batch to be full before it's sent",
+    )
+    coalesce_window_ms: int = Field(
+        0,
+        ge=0,
+        title="Coalescing window (ms)",
+        description="Hold item updates during this window, and only send the latest update of an item. Set to 0 to send every update",
+    )
+    compact_payloads: bool = Field(
+        True,
+        title="Compact payloads",
+        description="Only store the event identity and the keys of its items on AYON, instead of the full Aquarium event",
+    )
+    compress_threshold: int = Field(
+        4096,
+        ge=0,
+        title="Compression threshold (bytes)",
+        description="Compress compact payloads larger than this size. Set to 0 to disable compression",
+    )
+
+class ProcessorSettings(BaseSettingsModel):
+    """
+    Processor syncs the events stored by the leecher to AYON.
+    Events of different projects are processed in parallel, events of a same project in order.
+    """
+
+    workers: int = Field(
+        4,
+        ge=1,
+        title="Workers",
+        description="Number of projects processed in parallel",
+    )
+    queue_size: int = Field(
+        10,
+        ge=1,
+        title="Queue size",
+        description="Maximum number of enrolled jobs waiting per worker",
+    )
+    prefetch: int = Field(
+        20,
+        ge=1,
+        title="Prefetch",
+        description="Maximum number of jobs enrolled ahead of the workers",
+    )
+    coalesce_window: int = Field(
+        100,
+        ge=0,
+        title="Coalescing window",
+        description="When behind, jobs are enrolled by windows of this size and only the newest event of each item is processed. Set to 0 to process every event",
+    )
+    mirror: bool = Field(
+        False,
+        title="Local mirror",
+        description="Load the hierarchy and task assignees of paired projects on start, so events are processed with less Aquarium requests",
+    )
+    status_interval_ms: int = Field(
+        500,
+        ge=10,
+        title="Status interval (ms)",
+        description="Job statuses are sent to AYON in batches at this interval",
+    )
+
 class AquariumServiceSettings(BaseSettingsModel):
     """
     Aquarium services cares about handling Aquarium event and process them
@@ -29,6 +119,14 @@ class AquariumServiceSettings(BaseSettingsModel):
         title="Bot secret",
         description="Enter your Aquarium bot secret",
     )
+    leecher: LeecherSettings = Field(
+        default_factory=LeecherSettings,
+        title="Leecher",
+    )
+    processor: ProcessorSettings = Field(
+        default_factory=ProcessorSettings,
+        title="Processor",
+    )
 
 class TaskCondition(BaseSettingsModel):
     _layout: str = "compact"
@@ -20,4 +20,7 @@ DEFAULT_STATUSES=dict(
 logging.getLogger(__name__).addHandler(NullHandler())
 
 from .aquarium import Aquarium
-from .dotmap import DotMap
\ No newline at end of file
+from .dotmap import DotMap
+from .cache import QueryCache
+# httpx is a dependency of AYON server, which runs the addon routes
+from .async_aquarium import AsyncAquarium
@@ -6,7 +6,7 @@ from .auth import AquariumAuth
 from .events import Events
 from .item import Item
 from .edge import Edge
-from .tools import evaluate
+from .tools import evaluate, build_url
 from .items.bot import Bot
 from .items.user import User
 from .items.template import Template
@@ -20,16 +20,13 @@ from .items.playlist import Playlist
 from .element import Element
 from .events import Event
 from .utils import Utils
+from .lazy import ENTITY_MODES
+from .codec import get_codec
+from .transport import AquariumAdapter, create_retry, resolve_timeout, RETRY_STATUSES, IDEMPOTENT_METHODS
 
 
 import requests
 
-import sys
-if sys.version_info[0] > 2:
-    from urllib.parse import urljoin, urlparse
-else:
-    from urlparse import urljoin, urlparse
-
 import json
 import logging
 logger=logging.getLogger(__name__)
@@ -49,6 +46,40 @@ class Aquarium(object):
     :type domain: string, optional
     :param strict_dotmap: Specify if the dotmap should create new property dynamically (default : `False`). Set to `True` to have default Python behaviour like on Dict()
     :type strict_dotmap: boolean, optional
+    :param entity_mode: Specify how entities data are exposed (default : `dotmap`). `dotmap` converts the whole data to :class:`~aquarium.dotmap.DotMap` when an entity is cast. `lazy` wraps the raw data in a :class:`~aquarium.lazy.LazyData` view, converting nested values only when they are accessed. Missing keys return `None` in `lazy` mode.
+    :type entity_mode: string, optional
+    :param pool_connections: Number of connection pools to cache, one per host (default : `10`)
+    :type pool_connections: integer, optional
+    :param pool_maxsize: Maximum number of connections kept alive per host (default : `10`). Increase it when the instance is shared between threads.
+    :type pool_maxsize: integer, optional
+    :param pool_block: Wait for a free connection instead of opening a discarded one when the pool is full (default : `False`)
+    :type pool_block: boolean, optional
+    :param keep_alive: Enable TCP keep-alive probes on pooled connections (default : `True`)
+    :type keep_alive: boolean, optional
+    :param keep_alive_idle: Seconds of inactivity before the first TCP keep-alive probe (default : `60`)
+    :type keep_alive_idle: integer, optional
+    :param keep_alive_interval: Seconds between two TCP keep-alive probes (default : `15`)
+    :type keep_alive_interval: integer, optional
+    :param max_retries: Maximum number of retries on connection errors and retried HTTP statuses (default : `3`). Set to `0` to disable retries.
+    :type max_retries: integer, optional
+    :param backoff_factor: Exponential backoff factor between retries, in seconds (default : `0.5`)
+    :type backoff_factor: float, optional
+    :param backoff_max: Maximum wait between two retries, in seconds (default : `30`)
+    :type backoff_max: float, optional
+    :param backoff_jitter: Maximum random number of seconds added to each backoff (default : `0.5`)
+    :type backoff_jitter: float, optional
+    :param retry_statuses: HTTP status codes to retry (default : `429, 500, 502, 503, 504`). The `Retry-After` header is honored.
+    :type retry_statuses: iterable of integer, optional
+    :param retry_methods: HTTP verbs retried on connection errors and retried statuses (default : idempotent verbs). `429` responses are retried for every verb.
+    :type retry_methods: iterable of string, optional
+    :param timeout: Default requests timeout in seconds, or a (connect, read) tuple (default : `None`, no timeout)
+    :type timeout: float or tuple, optional
+    :param timeouts: Timeouts by API endpoint prefix, overriding `timeout` (Example: `{'query': 120, 'events/stream': (5, None)}`)
+    :type timeouts: dictionary, optional
+    :param cache: Cache of `query` and `traverse` results (default : `None`, no cache). Results are invalidated when the client modifies an entity they depend on. Use :func:`~aquarium.cache.QueryCache.subscribe` to invalidate them from the events stream too.
+    :type cache: :class:`~aquarium.cache.QueryCache`, optional
+    :param json_codec: JSON codec used to encode requests body and decode responses (default : `auto`). `auto` uses `orjson` or `msgspec` when installed, and the stdlib `json` otherwise. A :class:`~aquarium.codec.JSONCodec` instance can be given.
+    :type json_codec: string or :class:`~aquarium.codec.JSONCodec`, optional
 
     :var token: Get the current token (populated after a first :func:`~aquarium.aquarium.Aquarium.signin`)
     :var events: Access to Events class
@@ -79,20 +110,54 @@ class Aquarium(object):
     :vartype organisation: :class:`~aquarium.items.organisation.Organisation`
     :var utils: Access to Utils class
     :vartype utils: :class:`~aquarium.utils.Utils`
+    :var item_types: Classes used to cast items, by item type. Other types are cast as :class:`~aquarium.item.Item`
+    :vartype item_types: dictionary
+    :var collection_types: Classes used to cast other entities, by `_id` collection prefix
+    :vartype collection_types: dictionary
     """
 
-    def __init__(self, api_url='', token=None, api_version='v1', domain=None, strict_dotmap=False):
+    def __init__(self, api_url='', token=None, api_version='v1', domain=None, strict_dotmap=False, entity_mode='dotmap',
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keep_alive=True, keep_alive_idle=60, keep_alive_interval=15,
+                 max_retries=3, backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5,
+                 retry_statuses=RETRY_STATUSES, retry_methods=IDEMPOTENT_METHODS,
+                 timeout=None, timeouts=None, cache=None, json_codec='auto'):
         """
         Constructs a new instance.
         """
         # Session
         self.session=requests.Session()
+        adapter=AquariumAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            keep_alive_idle=keep_alive_idle,
+            keep_alive_interval=keep_alive_interval,
+            max_retries=create_retry(
+                max_retries=max_retries,
+                backoff_factor=backoff_factor,
+                backoff_max=backoff_max,
+                backoff_jitter=backoff_jitter,
+                retry_statuses=retry_statuses,
+                retry_methods=retry_methods,
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.timeout=timeout
+        self.timeouts=dict(timeouts or {})
+        self.cache=cache
+        self.json_codec=get_codec(json_codec)
 
         self.api_url=api_url
         self.api_version=api_version
         self.token=token
         self.domain=domain
         self.strict_dotmap=strict_dotmap
+        if entity_mode not in ENTITY_MODES:
+            raise ValueError('entity_mode must be one of {0}'.format(', '.join(ENTITY_MODES)))
+        self.entity_mode=entity_mode
 
         # Classes
         self.events=Events(parent=self)
@@ -113,6 +178,23 @@ class Aquarium(object):
         self.asset=Asset(parent=self)
         self.event=Event(parent=self)
 
+        # Cast dispatch tables
+        self.item_types={
+            'Project': self.project,
+            'Playlist': self.playlist,
+            'User': self.user,
+            'Template': self.template,
+            'Usergroup': self.usergroup,
+            'Asset': self.asset,
+            'Shot': self.shot,
+            'Task': self.task,
+            'Organisation': self.organisation,
+        }
+        self.collection_types={
+            'connections': self.edge,
+            'events': self.event,
+        }
+
     def do_request(self, *args, **kwargs):
         """
         Execute a request to the API
@@ -143,19 +225,24 @@ class Aquarium(object):
 
         args=list(args)
         typ=args[0]
-        path = self.api_url
+        endpoint=args[1] if len(args) > 1 else None
+        path=build_url(self.api_url, self.api_version, endpoint)
 
-        if len(args) > 1:
-            is_files = args[1].find('/files/') >= 0
-            if (is_files):
-                path = urljoin(path, args[1])
-            else:
-                path = urljoin(path, '{api_version}/{endpoint}'.format(
-                    api_version=self.api_version,
-                    endpoint=args[1]
-                ))
-        else:
-            path = urljoin(path, self.api_version)
+        if 'timeout' not in kwargs:
+            kwargs['timeout']=resolve_timeout(endpoint, self.timeout, self.timeouts)
+
+        cache_key=None
+        if self.cache is not None and not stream and decoding:
+            cache_key, found, result=self.cache.lookup_request(typ, endpoint, kwargs.get('json'))
+            if found:
+                logger.debug('Cached request : %s %s', typ, path)
+                return result
+
+        payload=kwargs.pop('json', None)
+        if payload is not None:
+            kwargs['data']=self.json_codec.dumps(payload)
+            headers=dict(headers or {})
+            headers['Content-Type']='application/json'
 
         logger.debug('Send request : %s %s', typ, path)
         response=self.session.request(typ, path, headers=headers, auth=AquariumAuth(self.token, self.domain), **kwargs)
@@ -163,7 +250,9 @@ class Aquarium(object):
         evaluate(response)
         if not stream:
             if decoding:
-                response=response.json()
+                response=self.json_codec.loads(response.content)
+                if cache_key is not None:
+                    self.cache.store_request(cache_key, endpoint, payload, response)
 
         return response
 
@@ -177,45 +266,76 @@ class Aquarium(object):
         :returns:   Instance of Edge or Item or items subclass
         :rtype:     :class:`~aquarium.edge.Edge` | :class:`~aquarium.item.Item` : [:class:`~aquarium.items.asset.Asset` | :class:`~aquarium.items.project.Project` | :class:`~aquarium.items.shot.Shot` | :class:`~aquarium.items.task.Task` | :class:`~aquarium.items.template.Template` | :class:`~aquarium.items.user.User` | :class:`~aquarium.items.usergroup.Usergroup`]
         """
-        value=data
-        #As Entity
-        if data and '_id' in data.keys():
-            id=data.get('_id')
-            cls=None
-            #As Item
-            if id.split('/')[0]=='items':
-                type=data.get('type')
-                if type=='Project':
-                    cls=self.project
-                elif type=='Playlist':
-                    cls=self.playlist
-                elif type=='User':
-                    cls=self.user
-                elif type=='Template':
-                    cls=self.template
-                elif type=='Usergroup':
-                    cls=self.usergroup
-                elif type=='Asset':
-                    cls=self.asset
-                elif type=='Shot':
-                    cls=self.shot
-                elif type=='Task':
-                    cls=self.task
-                elif type=='Organisation':
-                    cls=self.organisation
-                else:
-                    cls=self.item
-            #As Edge
-            elif id.split('/')[0]=='connections':
-                cls=self.edge
-            #As Event
-            elif id.split('/')[0]=='events':
-                cls=self.event
-
-            if cls is not None:
-                value=cls(data=data)
-
-        return value
+        if not data or not isinstance(data, dict):
+            return data
+
+        id=data.get('_id')
+        if not id:
+            return data
+
+        collection=id.partition('/')[0]
+        #As Item
+        if collection=='items':
+            cls=self.item_types.get(data.get('type'), self.item)
+        #As Edge, Event...
+        else:
+            cls=self.collection_types.get(collection)
+            if cls is None:
+                return data
+
+        return cls(data=data)
+
+    def cast_many(self, values=[]):
+        """
+        Creates item or edge instances from a list of dictionaries, in a single pass
+
+        Values which are not Aquarium entities are returned as is.
+
+        :param      values:       The objects item or edge from Aquarium API
+        :type       values:       list
+
+        :returns:   List of Edge or Item or items subclass instances
+        :rtype:     list of :class:`~aquarium.edge.Edge` | :class:`~aquarium.item.Item` | items subclass
+        """
+        item_types=self.item_types
+        collection_types=self.collection_types
+        default_item=self.item
+
+        result=[]
+        append=result.append
+        for data in values:
+            id=data.get('_id') if data and isinstance(data, dict) else None
+            if not id:
+                append(data)
+                continue
+
+            collection=id.partition('/')[0]
+            if collection=='items':
+                cls=item_types.get(data.get('type'), default_item)
+            else:
+                cls=collection_types.get(collection)
+                if cls is None:
+                    append(data)
+                    continue
+
+            append(cls(data=data))
+        return result
+
+    def register_type(self, cls, type=None, collection=None):
+        """
+        Register the class used by :func:`~aquarium.aquarium.Aquarium.cast` for an item type or a collection
+
+        :param      cls:         The class instance, bound to this Aquarium instance (Example: `aq.shot`)
+        :type       cls:         :class:`~aquarium.entity.Entity`
+        :param      type:        The item type (Example: `Shot`)
+        :type       type:        string, optional
+        :param      collection:  The collection prefix of the `_id` (Example: `connections`)
+        :type       collection:  string, optional
+        """
+        if type is not None:
+            self.item_types[type]=cls
+        if collection is not None:
+            self.collection_types[collection]=cls
 
     def signin(self, email='', password=''):
         """
@@ -314,7 +434,7 @@ class Aquarium(object):
 
         users = self.do_request('GET', 'users')
 
-        users = [self.cast(user) for user in users]
+        users = self.cast_many(users)
         return users
 
     def create_user (self, email, name=None, aquarium_url=None):
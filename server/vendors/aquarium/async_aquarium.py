@@ -0,0 +1,774 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import httpx
+
+from . import DEFAULT_STATUSES
+from .aquarium import Aquarium
+from .entity import Entity
+from .element import Element
+from .tools import evaluate, build_url, jsonify
+from .lazy import ENTITY_MODES
+from .codec import get_codec
+from .transport import compute_backoff, parse_retry_after, resolve_timeout, RETRY_STATUSES, IDEMPOTENT_METHODS
+
+import logging
+logger=logging.getLogger(__name__)
+
+
+class AsyncAquarium(object):
+    """
+    This class describes the asyncio counterpart of :class:`~aquarium.aquarium.Aquarium`
+
+    Requests are sent with a pooled `httpx.AsyncClient`, so an asyncio application is not blocked
+    while waiting for Aquarium. All methods sending a request are coroutines and must be awaited.
+
+    .. note::
+        The async client covers the query, traverse and CRUD surface of items and edges,
+        plus the :class:`~aquarium.async_aquarium.AsyncProject`, :class:`~aquarium.async_aquarium.AsyncUser`
+        and :class:`~aquarium.async_aquarium.AsyncBot` helpers. Other items are cast as :class:`~aquarium.async_aquarium.AsyncItem`.
+
+    :param api_url: Specify the URL of the API.
+    :type api_url: string
+    :param token: Specify the authentication token, to avoid :func:`~aquarium.async_aquarium.AsyncAquarium.signin`
+    :type token: string, optional
+    :param api_version: Specify the API version you want to use (default : `v1`).
+    :type api_version: string, optional
+    :param domain: Specify the domain used for unauthenticated requests. Mainly for Aquarium Fatfish Lab dev or local Aquarium server without DNS
+    :type domain: string, optional
+    :param strict_dotmap: Specify if the dotmap should create new property dynamically (default : `False`). Set to `True` to have default Python behaviour like on Dict()
+    :type strict_dotmap: boolean, optional
+    :param entity_mode: Specify how entities data are exposed, `dotmap` or `lazy` (default : `dotmap`). See :class:`~aquarium.aquarium.Aquarium`
+    :type entity_mode: string, optional
+    :param max_connections: Maximum number of concurrent connections (default : `20`)
+    :type max_connections: integer, optional
+    :param max_keepalive_connections: Maximum number of idle connections kept alive (default : `10`)
+    :type max_keepalive_connections: integer, optional
+    :param keepalive_expiry: Seconds before closing an idle connection (default : `30`)
+    :type keepalive_expiry: float, optional
+    :param max_retries: Maximum number of retries on connection errors and retried HTTP statuses (default : `3`). Set to `0` to disable retries.
+    :type max_retries: integer, optional
+    :param backoff_factor: Exponential backoff factor between retries, in seconds (default : `0.5`)
+    :type backoff_factor: float, optional
+    :param backoff_max: Maximum wait between two retries, in seconds (default : `30`)
+    :type backoff_max: float, optional
+    :param backoff_jitter: Maximum random number of seconds added to each backoff (default : `0.5`)
+    :type backoff_jitter: float, optional
+    :param retry_statuses: HTTP status codes to retry (default : `429, 500, 502, 503, 504`). The `Retry-After` header is honored.
+    :type retry_statuses: iterable of integer, optional
+    :param retry_methods: HTTP verbs retried on read errors and retried statuses (default : idempotent verbs). `429` responses are retried for every verb.
+    :type retry_methods: iterable of string, optional
+    :param timeout: Default requests timeout in seconds, or a (connect, read) tuple (default : `None`, no timeout)
+    :type timeout: float or tuple, optional
+    :param timeouts: Timeouts by API endpoint prefix, overriding `timeout`
+    :type timeouts: dictionary, optional
+    :param cache: Cache of `query` and `traverse` results (default : `None`, no cache)
+    :type cache: :class:`~aquarium.cache.QueryCache`, optional
+    :param json_codec: JSON codec used to encode requests body and decode responses (default : `auto`)
+    :type json_codec: string or :class:`~aquarium.codec.JSONCodec`, optional
+
+    :var token: Get the current token (populated after a first :func:`~aquarium.async_aquarium.AsyncAquarium.signin`)
+    :var client: The underlying HTTP client
+    :vartype client: `httpx.AsyncClient`
+    :var item: Access to AsyncItem class
+    :vartype item: :class:`~aquarium.async_aquarium.AsyncItem`
+    :var edge: Access to AsyncEdge class
+    :vartype edge: :class:`~aquarium.async_aquarium.AsyncEdge`
+    :var project: Access to AsyncProject subclass
+    :vartype project: :class:`~aquarium.async_aquarium.AsyncProject`
+    :var user: Access to AsyncUser subclass
+    :vartype user: :class:`~aquarium.async_aquarium.AsyncUser`
+    :var bot: Access to AsyncBot subclass
+    :vartype bot: :class:`~aquarium.async_aquarium.AsyncBot`
+    """
+
+    def __init__(self, api_url='', token=None, api_version='v1', domain=None, strict_dotmap=False, entity_mode='dotmap',
+                 max_connections=20, max_keepalive_connections=10, keepalive_expiry=30,
+                 max_retries=3, backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5,
+                 retry_statuses=RETRY_STATUSES, retry_methods=IDEMPOTENT_METHODS,
+                 timeout=None, timeouts=None, cache=None, json_codec='auto'):
+        """
+        Constructs a new instance.
+        """
+        self.client=httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            # Connection errors are retried by do_request
+            transport=httpx.AsyncHTTPTransport(retries=0),
+        )
+        self.max_retries=max_retries
+        self.backoff_factor=backoff_factor
+        self.backoff_max=backoff_max
+        self.backoff_jitter=backoff_jitter
+        self.retry_statuses=frozenset(retry_statuses)
+        self.retry_methods=frozenset(method.upper() for method in retry_methods)
+        self.timeout=timeout
+        self.timeouts=dict(timeouts or {})
+        self.cache=cache
+        self.json_codec=get_codec(json_codec)
+
+        self.api_url=api_url
+        self.api_version=api_version
+        self.token=token
+        self.domain=domain
+        self.strict_dotmap=strict_dotmap
+        if entity_mode not in ENTITY_MODES:
+            raise ValueError('entity_mode must be one of {0}'.format(', '.join(ENTITY_MODES)))
+        self.entity_mode=entity_mode
+
+        # Classes
+        self.element=Element(parent=self)
+        self.item=AsyncItem(parent=self)
+        self.edge=AsyncEdge(parent=self)
+        # SubClasses
+        self.bot=AsyncBot(parent=self)
+        self.user=AsyncUser(parent=self)
+        self.project=AsyncProject(parent=self)
+
+        # Cast dispatch tables
+        self.item_types={
+            'Project': self.project,
+            'User': self.user,
+        }
+        self.collection_types={
+            'connections': self.edge,
+        }
+
+    async def do_request(self, *args, **kwargs):
+        """
+        Execute a request to the API
+
+        :param      args:    Parameters used to send the request : HTTP verb, API endpoint
+        :type       args:    tuple
+        :param      kwargs:  Headers, data and parameters used for the request
+        :type       kwargs:  dictionary
+
+        :returns:   Request response
+        :rtype:     List or dictionary
+        """
+        decoding=True
+        if 'decoding' in kwargs:
+            decoding=kwargs.pop('decoding')
+
+        headers=dict(kwargs.pop('headers', None) or {})
+        if self.token:
+            headers['authorization']=self.token
+        if self.domain:
+            headers['aquarium-domain']=self.domain
+
+        typ=args[0].upper()
+        endpoint=args[1] if len(args) > 1 else None
+        path=build_url(self.api_url, self.api_version, endpoint)
+
+        timeout=kwargs.pop('timeout', resolve_timeout(endpoint, self.timeout, self.timeouts))
+        kwargs['timeout']=self._get_timeout(timeout)
+
+        cache_key=None
+        if self.cache is not None and decoding:
+            cache_key, found, result=self.cache.lookup_request(typ, endpoint, kwargs.get('json'))
+            if found:
+                logger.debug('Cached request : %s %s', typ, path)
+                return result
+
+        payload=kwargs.pop('json', None)
+        if payload is not None:
+            kwargs['content']=self.json_codec.dumps(payload)
+            headers['Content-Type']='application/json'
+
+        logger.debug('Send request : %s %s', typ, path)
+        response=await self._send(typ, path, headers=headers, **kwargs)
+
+        evaluate(response)
+        if decoding:
+            response=self.json_codec.loads(response.content)
+            if cache_key is not None:
+                self.cache.store_request(cache_key, endpoint, payload, response)
+
+        return response
+
+    async def _send(self, typ, path, **kwargs):
+        retries=0
+        while True:
+            retry_after=None
+            try:
+                response=await self.client.request(typ, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # The request never reached the server, it's safe to retry whatever the verb
+                if retries >= self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if typ not in self.retry_methods or retries >= self.max_retries:
+                    raise
+            else:
+                if retries >= self.max_retries or not self._is_retry(typ, response.status_code):
+                    return response
+                retry_after=parse_retry_after(response.headers.get('retry-after'))
+                await response.aclose()
+
+            retries+=1
+            wait=retry_after
+            if wait is None:
+                wait=compute_backoff(retries, self.backoff_factor, self.backoff_max, self.backoff_jitter)
+            logger.debug('Retry request %s %s in %.2fs (%s/%s)', typ, path, wait, retries, self.max_retries)
+            await asyncio.sleep(wait)
+
+    def _is_retry(self, typ, status_code):
+        if status_code == 429:
+            return True
+        return typ in self.retry_methods and status_code in self.retry_statuses
+
+    @staticmethod
+    def _get_timeout(timeout):
+        if isinstance(timeout, httpx.Timeout):
+            return timeout
+        if isinstance(timeout, (tuple, list)):
+            connect, read=timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    async def close(self):
+        """
+        Close the pooled connections
+        """
+        await self.client.aclose()
+
+    cast=Aquarium.cast
+    cast_many=Aquarium.cast_many
+    register_type=Aquarium.register_type
+
+    async def signin(self, email='', password=''):
+        """
+        Sign in a user with its email and password
+
+        :param      email:     The email of the user
+        :type       email:     string
+        :param      password:  The password of the user
+        :type       password:  string
+        """
+        return await self.user.signin(email=email, password=password)
+
+    async def signout(self):
+        """
+        Sign out current user by clearing the stored authentication token
+        """
+        await self.user.signout()
+
+    async def get_current_user(self):
+        """
+        Alias of :func:`~aquarium.async_aquarium.AsyncUser.get_current`
+
+        :returns:   A :class:`~aquarium.async_aquarium.AsyncUser` instance of the connected user.
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncUser` object
+        """
+        return await self.user.get_current()
+
+    async def get_server_status(self):
+        """
+        Gets the server status.
+
+        :returns:   The server status
+        :rtype:     dictionary
+        """
+        return await self.do_request('GET', 'status')
+
+    async def ping(self):
+        """
+        Ping Aquarium server
+
+        :returns: Ping response: pong
+        :rtype:   string
+        """
+        ping=await self.do_request('GET', 'ping', decoding=False)
+        return ping.text
+
+    async def query(self, meshql='', aliases={}):
+        """
+        Query entities
+
+        :param      meshql:        The meshql string
+        :type       meshql:        string
+        :param      aliases:       The aliases used in the meshql query
+        :type       aliases:       dictionary
+
+        :returns:   List of item, edge or VIEW used in the meshql query
+        :rtype:     list
+        """
+        logger.debug('Send query : meshql : %s / aliases : %r',
+                     meshql, aliases)
+        data=dict(query=meshql, aliases=aliases)
+        return await self.do_request('POST', 'query', json=data)
+
+
+class AsyncItem(Entity):
+    """
+    This class describes the asyncio counterpart of :class:`~aquarium.item.Item`
+    """
+
+    async def create(self, type='', data={}):
+        """
+        Create an item
+
+        :param      type:  The new item type
+        :type       type:  string
+        :param      data:  The new item data
+        :type       data:  dictionary, optional
+
+        :returns:   Item object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncItem`
+        """
+        payload=dict(type=type, data=data)
+        result=await self.do_request('POST', 'items', json=payload)
+        return self.parent.cast(result)
+
+    async def append(self, type='', data={}, edge_type='Child', edge_data={}, apply_template=None, template_key=None):
+        """
+        Create and append a new item to the current one
+
+        :param      type:            The new item type
+        :type       type:            string
+        :param      data:            The new item data, optional
+        :type       data:            dictionary
+        :param      apply_template:  Do apply template ?
+        :type       apply_template:  boolean, optional
+        :param      template_key:    The template key to apply
+        :type       template_key:    string, optional
+
+        :returns:   Dictionary composed by an item and its edge.
+        :rtype:     dict {item: :class:`~aquarium.async_aquarium.AsyncItem`, edge: :class:`~aquarium.async_aquarium.AsyncEdge`}
+        """
+        payload={
+            "item": {
+                "type": type,
+                "data": data
+            },
+            "edge": {
+                "type": edge_type,
+                "data": edge_data
+            }
+        }
+
+        if apply_template is not None:
+            payload["applyTemplate"]=apply_template
+
+        if template_key:
+            payload["templateKey"]=template_key
+
+        result=await self.do_request('POST', 'items/'+self._key+'/append', json=payload)
+        return self.parent.element(result)
+
+    async def link(self, to_key, type='Child', data={}):
+        """
+        Create an edge from this item to the item in to_key param
+
+        :returns:   Edge object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncEdge`
+        """
+        return await self.parent.edge.create(type, self._key, to_key, data)
+
+    async def traverse(self, meshql='', aliases={}):
+        """
+        Execute a traverse from the current item
+
+        :param      meshql:        The meshql string
+        :type       meshql:        string
+        :param      aliases:       The aliases used in the meshql query
+        :type       aliases:       dictionary, optional
+
+        :returns:   List of item and/or edge or VIEW used in the meshql query
+        :rtype:     list
+        """
+        logger.debug('Send traverse : meshql : %s / aliases : %r',
+                     meshql, aliases)
+        data=dict(query=meshql, aliases=aliases)
+        return await self.do_request('POST', 'items/'+self._key+'/traverse', json=data)
+
+    async def traverse_trashed(self, meshql='', aliases={}):
+        """
+        Execute a traverse from the current item on trashed_items
+
+        :returns:   List of item and/or edge or VIEW used in the meshql query
+        :rtype:     list
+        """
+        data=dict(query=meshql, aliases=aliases)
+        return await self.do_request('POST', 'trashed_items/'+self._key+'/traverse', json=data)
+
+    async def replace_data(self, data={}):
+        """
+        Replace the item data with new ones
+
+        :param      data:  The new item data
+        :type       data:  dictionary
+
+        :returns:   Item object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncItem`
+        """
+        logger.debug('Replacing data on item %s with %r', self._key, data)
+        result=await self.do_request('PUT', 'items/'+self._key, json=dict(data=data))
+        return self.parent.cast(result)
+
+    async def update_data(self, data={}, deep_merge=True):
+        """
+        Update the item data by merging the existing ones with the new ones
+
+        :param      data:        The new item data
+        :type       data:        dictionary
+        :param      deep_merge:  Merge nested objects
+        :type       deep_merge:  boolean, optional
+
+        :returns:   Item object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncItem`
+        """
+        logger.debug('Updating data on item %s with %r', self._key, data)
+        payload=dict(
+            data=data,
+            deepMerge=deep_merge
+        )
+        result=await self.do_request('PATCH', 'items/'+self._key, json=payload)
+        return self.parent.cast(result)
+
+    async def get(self, populate=False, history=False):
+        """
+        Get item object with its _key
+
+        :param      populate:  Populate `item.createdBy` and `item.updatedBy` with User object
+        :type       populate:  boolean
+        :param      history:   Get previous item's data history
+        :type       history:   boolean, optional
+
+        :returns:   Item object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncItem`
+        """
+        params={
+            'populate': populate,
+            'history': history
+        }
+        jsonify(params)
+
+        result=await self.do_request('GET', 'items/{0}/'.format(self._key), params=params)
+        return self.parent.cast(result)
+
+    async def get_parents(self, limit=50, offset=0):
+        """
+        Gets the parents of the item
+
+        :returns:   List of item and edge object
+        :rtype:     list of {item: :class:`~aquarium.async_aquarium.AsyncItem`, edge: :class:`~aquarium.async_aquarium.AsyncEdge`}
+        """
+        query="# <($Child)- {offset},{limit} *".format(
+            offset=offset,
+            limit=limit
+        )
+        result=await self.traverse(meshql=query)
+        return [self.parent.element(data) for data in result]
+
+    async def get_children(self, show_hidden=False, types=None, names=None, limit=50, offset=0):
+        """
+        Gets the children of the item
+
+        :param      show_hidden:  Show hidden items
+        :type       show_hidden:  boolean, optional
+        :param      types:  One string or list of string items type you want to filter
+        :type       types:  string or list, optional
+        :param      names:  One string or list of string items name you want to filter
+        :type       names:  string or list, optional
+
+        :returns:   List of item and edge object
+        :rtype:     list of {item: :class:`~aquarium.async_aquarium.AsyncItem`, edge: :class:`~aquarium.async_aquarium.AsyncEdge`}
+        """
+        query=["# -($Child)> {offset}, {limit}".format(
+            offset=offset,
+            limit=limit
+        )]
+        aliases=dict()
+
+        if types == None:
+            query.append('*')
+        else:
+            query.append('item.type IN @types')
+            if not isinstance(types, list): types=[types]
+            aliases['types']=types
+
+        if names != None:
+            query.append('AND item.data.name IN @names')
+            if not isinstance(names, list): names=[names]
+            aliases['names']=names
+
+        if not show_hidden:
+            query.append('AND edge.data.isHidden != true')
+
+        result=await self.traverse(meshql=' '.join(query), aliases=aliases)
+        return [self.parent.element(data) for data in result]
+
+    async def move(self, old_parent_key=None, new_parent_key=None):
+        """
+        Move item from old parent to new parent
+
+        :returns:   New item parent and new child edge
+        :rtype:     dictionary {item: :class:`~aquarium.async_aquarium.AsyncItem`,edge: :class:`~aquarium.async_aquarium.AsyncEdge`}
+        """
+        data=dict(
+            oldParentKey=old_parent_key,
+            newParentKey=new_parent_key
+        )
+        result=await self.do_request('PUT', 'items/'+self._key+'/move', json=data)
+        return self.parent.element(result)
+
+    async def trash(self):
+        """
+        Move item to the trash
+
+        :returns:   Trashed item
+        :rtype:     dictionary
+        """
+        result=await self.do_request('DELETE', 'items/{itemKey}/trash'.format(itemKey=self._key))
+        return self.parent.element(result)
+
+    async def restore(self):
+        """
+        Restore an item from trash
+
+        :returns:   Restored item
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncItem`
+        """
+        result=await self.do_request('POST', 'trashed_items/{itemKey}/restore'.format(itemKey=self._key))
+        return self.parent.cast(result)
+
+    async def delete(self):
+        """
+        Delete the item.
+
+        :returns:   Deleted item object from API
+        :rtype:     dictionary
+        """
+        return await self.do_request('DELETE', 'trashed_items/'+self._key)
+
+    async def import_json(self, content={}):
+        """
+        Import item hierarchy from json content
+
+        :returns:   Dictionary of imported items and edges
+        :rtype:     dictionary
+        """
+        return await self.do_request('POST', 'items/'+self._key+'/import/json', json=content)
+
+    async def export_json(self):
+        """
+        Export item hierarchy to json
+
+        :returns:   Exported items and edges
+        :rtype:     dictionary
+        """
+        return await self.do_request('GET', 'items/'+self._key+'/export/json')
+
+
+class AsyncEdge(Entity):
+    """
+    This class describes the asyncio counterpart of :class:`~aquarium.edge.Edge`
+    """
+
+    def set_data_variables(self, data={}):
+        """
+        Sets the data variables of the object
+
+        :param      data:  The object edge from Aquarium API
+        :type       data:  dictionary
+        """
+        super(AsyncEdge, self).set_data_variables(data=data)
+        self._from=data.get('_from', '')
+        self._to=data.get('_to', '')
+
+    async def create(self, type='', from_key='', to_key='', data={}):
+        """
+        Create an edge
+
+        :returns:   Edge object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncEdge`
+        """
+        payload=dict(fromKey=from_key,
+                     toKey=to_key,
+                     type=type,
+                     data=data)
+        result=await self.do_request('POST', 'edges', json=payload)
+        return self.parent.cast(result)
+
+    async def replace_data(self, data={}):
+        """
+        Replace the edge data with new ones
+
+        :returns:   Edge object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncEdge`
+        """
+        result=await self.do_request('PUT', 'edges/'+self._key, json=dict(data=data))
+        return self.parent.cast(result)
+
+    async def update_data(self, data={}, deep_merge=True):
+        """
+        Update the edge data by merging the existing ones with the new ones
+
+        :returns:   Edge object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncEdge`
+        """
+        payload=dict(
+            data=data,
+            deepMerge=deep_merge
+        )
+        result=await self.do_request('PATCH', 'edges/'+self._key, json=payload)
+        return self.parent.cast(result)
+
+    async def get(self, populate=False):
+        """
+        Get the edge by its _key
+
+        :returns:   Edge object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncEdge`
+        """
+        params=dict(populate=populate)
+        jsonify(params)
+        result=await self.do_request('GET', 'edges/{0}/'.format(self._key), params=params)
+        return self.parent.cast(result)
+
+    async def delete(self):
+        """
+        Delete the edge
+
+        :returns:   Deleted edge object from API
+        :rtype:     dictionary
+        """
+        return await self.do_request('DELETE', 'edges/' + self._key)
+
+
+class AsyncProject(AsyncItem):
+    """
+    This class describes the asyncio counterpart of :class:`~aquarium.items.project.Project`
+    """
+
+    async def get_all(self, show_all=False):
+        """
+        Gets all projects accessible by the connected user
+
+        :param      show_all:  Add completed and trashed projects
+        :type       show_all:  boolean, optional
+
+        :returns:   List of AsyncProject class
+        :rtype:     List of :class:`~aquarium.async_aquarium.AsyncProject`
+        """
+        query=list()
+        query.append('# $Project')
+
+        if not show_all:
+            query.append('AND item.data.completion != 1 AND item.data.completion != -1 AND NOT (<($Trash)- *)')
+
+        query.append('SORT item.data.name ASC')
+        result=await self.parent.query(meshql=' '.join(query))
+        return [self.parent.cast(data) for data in result]
+
+    async def get_properties(self):
+        """
+        Gets all the properties of the project
+
+        :returns:   List of Properties
+        :rtype:     List of :class:`~aquarium.element.Element`
+        """
+        result=await self.traverse(meshql="# -($Child)> $Properties")
+        return [self.parent.element(data) for data in result]
+
+    async def get_statuses(self):
+        """
+        Gets the statuses of the project
+
+        :returns:   The statuses
+        :rtype:     dictionary
+        """
+        statuses_dct=dict()
+
+        statuses=await self.traverse(meshql="# -($Child)> $Properties AND item.data.tasks_status != null SORT null VIEW item.data.tasks_status")
+        for status in statuses:
+            if status:
+                name=status.get('status')
+                if name not in statuses_dct:
+                    statuses_dct[name]=status
+        return statuses_dct or DEFAULT_STATUSES
+
+
+class AsyncUser(AsyncItem):
+    """
+    This class describes the asyncio counterpart of :class:`~aquarium.items.user.User`
+    """
+
+    def set_data_variables(self, data={}):
+        """
+        Sets the data variables of the User
+
+        :param      data:  The object item from Aquarium API
+        :type       data:  dictionary
+        """
+        super(AsyncUser, self).set_data_variables(data=data)
+        self.active=data.get('active', False)
+
+    async def signin(self, email='', password=''):
+        """
+        Sign in a user with it's email and password
+
+        :returns: Dictionary User object
+        :rtype: Dict {user: :class:`~aquarium.async_aquarium.AsyncUser`}
+        """
+        payload=dict(email=email, password=password)
+        result=await self.do_request('POST', 'signin', json=payload)
+
+        self.parent.token=result.pop("token")
+        return self.parent.element(result)
+
+    async def signout(self):
+        """
+        Sign out the current user by clearing the stored authentication token
+
+        :returns: None
+        """
+        await self.do_request('POST', 'signout', decoding=False)
+        self.parent.token=None
+
+    async def get_profile(self):
+        """
+        Get the current profil.
+
+        :returns:   User, Usergroups and Organisations object
+        :rtype:     Dict {user: :class:`~aquarium.async_aquarium.AsyncUser`, usergroups: [:class:`~aquarium.async_aquarium.AsyncItem`], organisations: [:class:`~aquarium.async_aquarium.AsyncItem`]}
+        """
+        result=await self.do_request('GET', 'users/me')
+        return self.parent.element(result)
+
+    async def get_current(self):
+        """
+        Get the current user.
+
+        :returns:   User object
+        :rtype:     :class:`~aquarium.async_aquarium.AsyncUser`
+        """
+        profile=await self.get_profile()
+        return profile.user
+
+
+class AsyncBot(AsyncUser):
+    """
+    This class describes the asyncio counterpart of :class:`~aquarium.items.bot.Bot`
+    """
+
+    async def signin(self, secret=''):
+        """
+        Sign in a bot with it's secret
+
+        :param      secret:  The secret of the bot
+        :type       secret:  string
+
+        :returns: Dictionary Bot object
+        :rtype: Dict {bot: :class:`~aquarium.async_aquarium.AsyncBot`}
+        """
+        logger.debug('Connect bot %s', self._key)
+        payload=dict(secret=secret)
+        result=await self.do_request('POST', 'bots/{0}/signin'.format(self._key), data=payload)
+
+        self.parent.token=result.pop("token")
+        return self.parent.element(result)
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+import threading
+from collections import OrderedDict
+
+import logging
+logger=logging.getLogger(__name__)
+
+# Collections of an entity `_id`, the key is the second part of the endpoint or `_id`
+KEYED_COLLECTIONS=frozenset(['items', 'trashed_items', 'connections', 'edges', 'events'])
+
+
+def endpoint_key(endpoint):
+    """
+    Get the entity key targeted by an API endpoint or an entity `_id`
+
+    :param      endpoint:  The API endpoint (Example: `items/123/traverse`) or `_id` (Example: `items/123`)
+    :type       endpoint:  string
+
+    :returns:   The entity key (Example: `123`), or None if the endpoint doesn't target an entity
+    :rtype:     string
+    """
+    if not endpoint:
+        return None
+
+    parts=str(endpoint).strip('/').split('/')
+    if len(parts) > 1 and parts[0] in KEYED_COLLECTIONS and parts[1]:
+        return parts[1]
+    return None
+
+
+def is_cacheable(method, endpoint):
+    """
+    Check if a request only reads data with a meshql query
+
+    :param      method:    The HTTP verb
+    :type       method:    string
+    :param      endpoint:  The API endpoint
+    :type       endpoint:  string
+
+    :returns:   True for `query` and `traverse` requests
+    :rtype:     boolean
+    """
+    if method.upper() != 'POST' or not endpoint:
+        return False
+
+    endpoint=endpoint.strip('/')
+    return endpoint == 'query' or endpoint.endswith('/traverse')
+
+
+def collect_keys(value, keys=None):
+    """
+    Collect the entity keys referenced by a query result
+
+    `_key` values are collected, as well as the keys of `_id`, `_from` and `_to` values.
+
+    :param      value:  The query result
+    :type       value:  list or dictionary
+    :param      keys:   The set filled with the keys
+    :type       keys:   set, optional
+
+    :returns:   The entity keys
+    :rtype:     set
+    """
+    if keys is None:
+        keys=set()
+
+    stack=[value]
+    while stack:
+        value=stack.pop()
+        if isinstance(value, dict):
+            for name, child in value.items():
+                if name == '_key':
+                    if child:
+                        keys.add(str(child))
+                elif name in ('_id', '_from', '_to'):
+                    key=endpoint_key(child)
+                    if key:
+                        keys.add(key)
+                elif isinstance(child, (dict, list)):
+                    stack.append(child)
+        elif isinstance(value, list):
+            stack.extend(child for child in value if isinstance(child, (dict, list)))
+    return keys
+
+
+def event_keys(event):
+    """
+    Get the entity keys touched by an event
+
+    :param      event:  The event
+    :type       event:  :class:`~aquarium.events.Event`
+
+    :returns:   The entity keys
+    :rtype:     set
+    """
+    keys=set()
+    key=endpoint_key(getattr(event, 'emittedFrom', None))
+    if key:
+        keys.add(key)
+
+    data=getattr(event, 'data', None)
+    if data is None:
+        return keys
+    if hasattr(data, 'toDict'):
+        data=data.toDict()
+    if not isinstance(data, dict):
+        return keys
+
+    # Only the touched entities, not the whole data of the items
+    for name in ('_key', '_id', '_from', '_to'):
+        if data.get(name):
+            collect_keys({name: data[name]}, keys)
+    for value in data.values():
+        if isinstance(value, dict):
+            for name in ('_key', '_id', '_from', '_to'):
+                if value.get(name):
+                    collect_keys({name: value[name]}, keys)
+    return keys
+
+
+class QueryCache(object):
+    """
+    This class describes a cache of meshql query and traverse results.
+
+    Results are stored by (endpoint, meshql, aliases), expire after `ttl` seconds,
+    and the least recently used results are evicted when the cache is full.
+
+    Each result is tagged with the entity keys it depends on: the key of the traversed item,
+    the keys given as aliases and the keys found in the result. A result is invalidated
+    when one of these entities is modified by the client or touched by an event
+    (see :func:`~aquarium.cache.QueryCache.subscribe`).
+
+    Results are stored serialized, so a cached result can be modified by the caller safely.
+
+    :param ttl: Number of seconds a result is kept. `None` keeps results until they are evicted or invalidated
+    :type ttl: float, optional
+    :param maxsize: Maximum number of results kept
+    :type maxsize: integer, optional
+
+    :var hits: Number of results served from the cache
+    :var misses: Number of results requested to the API
+    :var invalidations: Number of results invalidated
+    """
+
+    def __init__(self, ttl=60, maxsize=256):
+        self.ttl=ttl
+        self.maxsize=maxsize
+        self.hits=0
+        self.misses=0
+        self.invalidations=0
+
+        self._entries=OrderedDict()
+        self._tags={}
+        self._lock=threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(endpoint, meshql='', aliases=None):
+        """
+        Create the cache key of a query
+
+        :param      endpoint:  The API endpoint
+        :type       endpoint:  string
+        :param      meshql:    The meshql string
+        :type       meshql:    string
+        :param      aliases:   The aliases used in the meshql query
+        :type       aliases:   dictionary, optional
+
+        :returns:   The cache key
+        :rtype:     tuple
+        """
+        return (endpoint.strip('/'), meshql, json.dumps(aliases or {}, sort_keys=True, default=str))
+
+    def get(self, key):
+        """
+        Get a cached result
+
+        :param      key:  The cache key from :func:`~aquarium.cache.QueryCache.make_key`
+        :type       key:  tuple
+
+        :returns:   A tuple (found, result)
+        :rtype:     tuple
+        """
+        with self._lock:
+            entry=self._entries.get(key)
+            if entry is None:
+                self.misses+=1
+                return False, None
+
+            expires, payload, tags=entry
+            if expires is not None and expires <= time.time():
+                self._remove(key)
+                self.misses+=1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits+=1
+        return True, json.loads(payload)
+
+    def set(self, key, result, tags=()):
+        """
+        Store a result
+
+        :param      key:     The cache key from :func:`~aquarium.cache.QueryCache.make_key`
+        :type       key:     tuple
+        :param      result:  The query result
+        :type       result:  list or dictionary
+        :param      tags:    The entity keys the result depends on, in addition to the keys found in the result
+        :type       tags:    iterable of string, optional
+        """
+        if not self.maxsize:
+            return
+
+        tags=collect_keys(result, set(str(tag) for tag in tags if tag))
+        payload=json.dumps(result)
+        expires=time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key]=(expires, payload, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def lookup_request(self, method, endpoint, payload=None):
+        """
+        Get the cached result of an API request
+
+        Requests modifying an entity invalidate the results depending on it.
+
+        :param      method:    The HTTP verb
+        :type       method:    string
+        :param      endpoint:  The API endpoint
+        :type       endpoint:  string
+        :param      payload:   The JSON body of the request
+        :type       payload:   dictionary, optional
+
+        :returns:   A tuple (cache key, found, result). The cache key is None if the request is not cacheable
+        :rtype:     tuple
+        """
+        if not is_cacheable(method, endpoint):
+            if method.upper() != 'GET':
+                self.invalidate(endpoint_key(endpoint))
+            return None, False, None
+
+        payload=payload or {}
+        key=self.make_key(endpoint, payload.get('query', ''), payload.get('aliases'))
+        found, result=self.get(key)
+        return key, found, result
+
+    def store_request(self, key, endpoint, payload, result):
+        """
+        Store the result of an API request looked up with :func:`~aquarium.cache.QueryCache.lookup_request`
+
+        The result is tagged with the traversed item key and the keys given as aliases.
+
+        :param      key:       The cache key
+        :type       key:       tuple
+        :param      endpoint:  The API endpoint
+        :type       endpoint:  string
+        :param      payload:   The JSON body of the request
+        :type       payload:   dictionary
+        :param      result:    The decoded response
+        :type       result:    list or dictionary
+        """
+        tags=[endpoint_key(endpoint)]
+        aliases=(payload or {}).get('aliases') or {}
+        tags.extend(value for value in aliases.values() if isinstance(value, (str, int)) and not isinstance(value, bool))
+        self.set(key, result, tags)
+
+    def invalidate(self, *keys):
+        """
+        Invalidate the results depending on entities
+
+        :param      keys:  The entity keys or `_id`
+        :type       keys:  string
+
+        :returns:   Number of results invalidated
+        :rtype:     integer
+        """
+        count=0
+        with self._lock:
+            for key in keys:
+                if not key:
+                    continue
+                key=str(key)
+                tag=endpoint_key(key) or key
+                for entry_key in list(self._tags.get(tag, ())):
+                    self._remove(entry_key)
+                    count+=1
+            self.invalidations+=count
+
+        if count:
+            logger.debug('Invalidate %s cached queries for %r', count, keys)
+        return count
+
+    def invalidate_event(self, event):
+        """
+        Invalidate the results depending on the entities touched by an event
+
+        :param      event:  The event
+        :type       event:  :class:`~aquarium.events.Event`
+
+        :returns:   Number of results invalidated
+        :rtype:     integer
+        """
+        return self.invalidate(*event_keys(event))
+
+    def subscribe(self, events, topic='*'):
+        """
+        Invalidate the cached results from the events stream
+
+        The events listener must be started to receive the events.
+
+        :param      events:  The events listener
+        :type       events:  :class:`~aquarium.events.Events`
+        :param      topic:   The topic of the events invalidating the results
+        :type       topic:   string, optional
+
+        :returns:   The callback, to unsubscribe
+        :rtype:     Callback object :class:`~aquarium.events._Callback`
+        """
+        return events.subscribe(topic, self.invalidate_event)
+
+    def clear(self):
+        """
+        Remove all the cached results
+        """
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        expires, payload, tags=self._entries.pop(key)
+        for tag in tags:
+            keys=self._tags.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import json
+
+import logging
+logger=logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson=None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec=None
+
+
+def default(value):
+    """
+    Convert the values the JSON encoders don't support natively
+
+    Entities data (:class:`~aquarium.lazy.LazyData`, :class:`~aquarium.lazy.LazyList`) are converted to their raw value.
+
+    :param      value:  The value to convert
+    :type       value:  any
+
+    :returns:   A serializable value
+    :rtype:     any
+    """
+    if hasattr(value, 'toDict'):
+        return value.toDict()
+    if hasattr(value, 'toList'):
+        return value.toList()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError('Object of type {0} is not JSON serializable'.format(type(value).__name__))
+
+
+class JSONCodec(object):
+    """
+    This class describes the stdlib JSON codec, used to encode requests body and decode responses
+
+    Subclass it and override :func:`~aquarium.codec.JSONCodec.dumps` and :func:`~aquarium.codec.JSONCodec.loads` to use another JSON library.
+
+    :var name: The name of the codec
+    """
+    name='json'
+
+    def dumps(self, value):
+        """
+        Encode a value
+
+        :param      value:  The value to encode
+        :type       value:  any
+
+        :returns:   The JSON document
+        :rtype:     bytes
+        """
+        return json.dumps(value, default=default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, content):
+        """
+        Decode a JSON document
+
+        :param      content:  The JSON document
+        :type       content:  bytes or string
+
+        :returns:   The decoded value
+        :rtype:     any
+        """
+        return json.loads(content)
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(self.__class__.__name__, self.name)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    This class describes the `orjson <https://github.com/ijl/orjson>`_ codec
+
+    Values orjson can't encode (Example: integers over 64 bits) fall back to the stdlib codec.
+    """
+    name='orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson is not installed')
+
+    def dumps(self, value):
+        try:
+            return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super(OrjsonCodec, self).dumps(value)
+
+    def loads(self, content):
+        return orjson.loads(content)
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    This class describes the `msgspec <https://jcristharif.com/msgspec/>`_ codec
+    """
+    name='msgspec'
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError('msgspec is not installed')
+        self.encoder=msgspec.json.Encoder(enc_hook=default)
+        self.decoder=msgspec.json.Decoder()
+
+    def dumps(self, value):
+        try:
+            return self.encoder.encode(value)
+        except (TypeError, OverflowError):
+            return super(MsgspecCodec, self).dumps(value)
+
+    def loads(self, content):
+        return self.decoder.decode(content)
+
+
+CODECS={
+    'json': JSONCodec,
+    'orjson': OrjsonCodec,
+    'msgspec': MsgspecCodec,
+}
+
+
+def get_codec(codec='auto'):
+    """
+    Get a JSON codec
+
+    :param      codec:  The codec name (`auto`, `orjson`, `msgspec` or `json`) or instance. `auto` uses the fastest installed library, and the stdlib `json` otherwise
+    :type       codec:  string or :class:`~aquarium.codec.JSONCodec`
+
+    :returns:   The codec
+    :rtype:     :class:`~aquarium.codec.JSONCodec`
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if codec in (None, 'auto'):
+        if orjson is not None:
+            return OrjsonCodec()
+        if msgspec is not None:
+            return MsgspecCodec()
+        return JSONCodec()
+
+    if codec not in CODECS:
+        raise ValueError('codec must be one of auto, {0}'.format(', '.join(CODECS)))
+    return CODECS[codec]()
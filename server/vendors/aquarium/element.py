@@ -8,11 +8,13 @@ class Element(object):
 
     def __call__(self, data={}):
         inst=self.__class__()
+        cast=self.parent.cast
+        cast_many=self.parent.cast_many
         for key, value in data.items():
             if isinstance(value, dict):
-                value=self.parent.cast(value)
+                value=cast(value)
             elif isinstance(value, list):
-                value=[self.parent.cast(v) if isinstance(v, dict) else v for v in value]
+                value=cast_many(value)
             setattr(inst, key, value)
         return inst
 
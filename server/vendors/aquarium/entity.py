@@ -2,6 +2,7 @@
 from . import JSON_CONTENT_TYPE
 from .tools import evaluate, pretty_print_format
 from .dotmap import DotMap
+from .lazy import LazyData
 import logging
 logger=logging.getLogger(__name__)
 
@@ -34,6 +35,12 @@ class Entity(object):
 
         inst=self.__class__(parent=self.parent)
 
+        # As dict, every variable is set by set_data_variables
+        if data and isinstance(data, dict):
+            inst.data=dict()
+            inst.set_data_variables(data=data)
+            return inst
+
         inst._key=''
         inst._id=''
         inst._rev=''
@@ -74,7 +81,7 @@ class Entity(object):
         for key, value in vars(self).items():
             if key=='parent':
                 continue
-            if isinstance(value, DotMap):
+            if isinstance(value, (DotMap, LazyData)):
                 entity[key]= value.toDict()
             else:
                 entity[key]=value
@@ -102,7 +109,21 @@ class Entity(object):
 
         entity_data=data.get('data')
         if entity_data:
-            self.data=DotMap(entity_data, _dynamic=(not bool(self.parent.strict_dotmap)))
+            self.data=self.wrap_data(entity_data)
+
+    def wrap_data(self, entity_data):
+        """
+        Wrap the raw entity data according to the parent `entity_mode`
+
+        :param      entity_data:  The raw data of the entity
+        :type       entity_data:  dictionary
+
+        :returns:   The data with attribute access
+        :rtype:     :class:`~aquarium.dotmap.DotMap` or :class:`~aquarium.lazy.LazyData`
+        """
+        if self.parent.entity_mode == 'lazy':
+            return LazyData(entity_data, strict=bool(self.parent.strict_dotmap))
+        return DotMap(entity_data, _dynamic=(not bool(self.parent.strict_dotmap)))
 
     def do_request(self, *args, **kwargs):
         """
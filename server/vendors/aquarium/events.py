@@ -4,18 +4,315 @@
 import re
 import json
 import time
-import codecs
+import queue
+import threading
 
 from .entity import Entity
 from .tools import pretty_print_format
-from .dotmap import DotMap
 
 import logging
 logger=logging.getLogger(__name__)
 
 # Technically, we should support streams that mix line endings.  This regex,
 # however, assumes that a system will provide consistent line endings.
-end_of_field = re.compile(r'\r\n\r\n|\r\r|\n\n')
+end_of_field = re.compile(br'\r\n\r\n|\r\r|\n\n')
+# Longest end of field minus one, scanned again when a chunk is received
+END_OF_FIELD_OVERLAP = 3
+sse_line_pattern = re.compile('(?P<name>[^:]*):?( ?(?P<value>.*))?')
+topic_pattern = re.compile(r"^(?:custom[.])?(?P<category>\w+)([.](?P<verb>\w+))?([.](\w+))*$")
+
+
+class SSEDecoder(object):
+    """
+    This class describes an incremental decoder of a Server-Sent Events stream.
+
+    Chunks are appended to a bytes buffer and only the newly received bytes are scanned
+    for the end of an event, so large events are decoded in linear time.
+    """
+
+    def __init__(self):
+        self.buf = bytearray()
+        self._start = 0
+        self._scan = 0
+
+    def feed(self, chunk):
+        """
+        Append a chunk of the stream
+
+        :param      chunk:  The chunk received
+        :type       chunk:  bytes
+        """
+        if self._start:
+            # Drop the events already decoded, once per chunk
+            del self.buf[:self._start]
+            self._scan -= self._start
+            self._start = 0
+        self.buf += chunk
+
+    def next_message(self):
+        """
+        Get the next complete event of the stream
+
+        :returns:   The raw event, or None if no complete event was received yet
+        :rtype:     string
+        """
+        matched = end_of_field.search(self.buf, self._scan)
+        if matched is None:
+            self._scan = max(self._start, len(self.buf) - END_OF_FIELD_OVERLAP)
+            return None
+
+        raw = self.buf[self._start:matched.start()]
+        self._start = self._scan = matched.end()
+        # SSE streams are always UTF-8 encoded
+        return raw.decode('utf-8', 'replace')
+
+    def discard(self):
+        """
+        Discard the incomplete event received, the SSE spec only supports resuming from a whole event
+        """
+        self.buf = bytearray()
+        self._start = 0
+        self._scan = 0
+
+
+class TopicRouter(object):
+    """
+    This class describes the routing of events to the callbacks subscribed to their topic.
+
+    Subscribed topics are compiled into a trie of topic parts. A pattern matches a topic when each
+    of its parts is equal to the topic part, or is a `*` wildcard, so `item.*.Shot` matches
+    `item.created.Shot` and `item.updated.Shot`. A pattern shorter than the topic matches all its
+    sub-topics: `item.created` matches `item.created.Shot`, and `*` matches all events.
+
+    Callbacks of a topic are resolved once and cached until the subscriptions change.
+    Most specific patterns are triggered first, and `*` last.
+
+    :param listeners: Callbacks by topic pattern
+    :type listeners: dictionary
+    :param cache_size: Maximum number of topics kept in the dispatch cache
+    :type cache_size: integer, optional
+    """
+
+    def __init__(self, listeners={}, cache_size=1024):
+        self.cache_size = cache_size
+        self._cache = {}
+        self._root = {}
+
+        index = 0
+        for pattern, callbacks in listeners.items():
+            parts = pattern.split('.')
+            # Sort by more parts, less wildcards, then subscription order
+            rank = (-len(parts), parts.count('*'))
+            node = self._root
+            for part in parts:
+                node = node.setdefault(part, {})
+            matches = node.setdefault(None, [])
+            for callback in callbacks:
+                matches.append((rank, index, callback))
+                index += 1
+
+    def match(self, topic):
+        """
+        Get the callbacks subscribed to a topic
+
+        Custom topics (`custom.category.verb`) also match the patterns of their native topic (`category.verb`).
+
+        :param      topic:  The event topic
+        :type       topic:  string
+
+        :returns:   The callbacks
+        :rtype:     tuple
+        """
+        callbacks = self._cache.get(topic)
+        if callbacks is not None:
+            return callbacks
+
+        matches = []
+        self._collect(self._root, (topic or '').split('.'), 0, matches)
+        if topic and topic.startswith('custom.'):
+            self._collect(self._root, topic[len('custom.'):].split('.'), 0, matches)
+
+        seen = set()
+        callbacks = []
+        for rank, index, callback in sorted(matches, key=lambda match: match[:2]):
+            if index not in seen:
+                seen.add(index)
+                callbacks.append(callback)
+        callbacks = tuple(callbacks)
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[topic] = callbacks
+        return callbacks
+
+    def _collect(self, node, parts, depth, matches):
+        if depth:
+            matches.extend(node.get(None, ()))
+        if depth == len(parts):
+            return
+
+        child = node.get(parts[depth])
+        if child is not None:
+            self._collect(child, parts, depth + 1, matches)
+        if parts[depth] != '*':
+            child = node.get('*')
+            if child is not None:
+                self._collect(child, parts, depth + 1, matches)
+
+
+# Copied with batches to services/common/dispatcher.py for the services, keep both in sync
+def default_event_key(event):
+    """
+    Get the ordering key of an event: the entity which emitted it, or the item of its data
+
+    :param      event:  The event
+    :type       event:  :class:`~aquarium.events.Event`
+
+    :returns:   The key
+    :rtype:     string
+    """
+    if event.emittedFrom:
+        return event.emittedFrom
+
+    data = getattr(event, 'data', None)
+    item = data.get('item') if data else None
+    if item:
+        return item.get('_key') or event._key
+    return event._key
+
+
+class EventDispatcher(object):
+    """
+    This class describes the execution of events callbacks by a pool of worker threads.
+
+    Events are queued in bounded queues, so a slow callback doesn't block the reading of the stream.
+    When ordered, events with the same key are always executed by the same worker, in the order
+    they were received. Otherwise, events are executed by the first available worker.
+
+    :param dispatch: The function executing the callbacks of an event
+    :type dispatch: function
+    :param workers: Number of worker threads
+    :type workers: integer, optional
+    :param queue_size: Maximum number of events waiting in each worker queue (in the shared queue when unordered)
+    :type queue_size: integer, optional
+    :param ordered: Keep the order of events with the same key
+    :type ordered: boolean, optional
+    :param key: Function returning the ordering key of an event (default : :func:`~aquarium.events.default_event_key`)
+    :type key: function, optional
+    :param block: Wait for a free slot when a queue is full. Otherwise the event is dropped
+    :type block: boolean, optional
+
+    :var dispatched: Number of events executed
+    :var errors: Number of events whose callbacks raised an exception
+    :var blocked: Number of events which waited for a free slot in a full queue
+    :var dropped: Number of events dropped because a queue was full
+    """
+
+    def __init__(self, dispatch, workers=4, queue_size=1000, ordered=True, key=None, block=True):
+        self.dispatch = dispatch
+        self.workers = max(int(workers), 1)
+        self.ordered = ordered
+        self.key = key or default_event_key
+        self.block = block
+
+        self.dispatched = 0
+        self.errors = 0
+        self.blocked = 0
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._queues = [queue.Queue(maxsize=queue_size) for i in range(self.workers if ordered else 1)]
+        self._threads = []
+
+    @property
+    def queue_depth(self):
+        """
+        Get the number of events waiting to be executed
+        """
+        return sum(q.qsize() for q in self._queues)
+
+    def stats(self):
+        """
+        Get the gauges of the dispatcher
+
+        :returns:   Queue depth, and number of dispatched, failed, blocked and dropped events
+        :rtype:     dictionary
+        """
+        return dict(
+            queued=self.queue_depth,
+            dispatched=self.dispatched,
+            errors=self.errors,
+            blocked=self.blocked,
+            dropped=self.dropped,
+        )
+
+    def start(self):
+        """
+        Start the worker threads
+        """
+        for index in range(self.workers):
+            q = self._queues[index % len(self._queues)]
+            thread = threading.Thread(target=self._work, args=(q,), name='aquarium-events-%s' % index)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, event):
+        """
+        Queue an event
+
+        :param      event:  The event
+        :type       event:  :class:`~aquarium.events.Event`
+
+        :returns:   False if the event was dropped
+        :rtype:     boolean
+        """
+        q = self._queues[0]
+        if self.ordered:
+            q = self._queues[hash(self.key(event)) % len(self._queues)]
+
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            if not self.block:
+                self.dropped += 1
+                logger.warning('Events queue is full, drop event %s #%s', event.topic, event._key)
+                return False
+
+            self.blocked += 1
+            q.put(event)
+        return True
+
+    def stop(self, wait=True):
+        """
+        Stop the worker threads once the queued events are executed
+
+        :param      wait:  Wait for the worker threads to finish
+        :type       wait:  boolean, optional
+        """
+        for index in range(len(self._threads)):
+            self._queues[index % len(self._queues)].put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def _work(self, q):
+        while True:
+            event = q.get()
+            if event is None:
+                return
+
+            try:
+                self.dispatch(event)
+            except Exception:
+                logger.exception('Event callback failed for %s #%s', event.topic, event._key)
+                with self._lock:
+                    self.errors += 1
+            with self._lock:
+                self.dispatched += 1
+
 
 class Events(object):
     """
@@ -31,11 +328,13 @@ class Events(object):
         self.parent = parent
         self.wait = wait
         self.chunk_size = chunk_size
-        self.buf = ''
+        self.decoder = SSEDecoder()
 
         self.listening = False
         self.last_timestamp = None
         self.listeners = {}
+        self.dispatcher = None
+        self._router = None
 
         self.headers = {
             'Content-Type': 'text/event-stream',
@@ -58,35 +357,63 @@ class Events(object):
         self.stream = self.parent.do_request('GET', '/events/stream', headers=self.headers, stream=True, decoding=False)
         self.stream_iterator = self._iter_content()
 
-        encoding = self.stream.encoding or self.stream.apparent_encoding
-        self.decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
-
         return self
 
-    def start(self):
+    def start(self, workers=0, queue_size=1000, ordered=True, key=None, block=True):
         """
         Starts processing events and trigger the callbacks.
+
+        By default, callbacks are executed by the thread reading the stream. Set `workers` to execute
+        them by a :class:`~aquarium.events.EventDispatcher`, available as `dispatcher` while listening.
+
+        :param      workers:     Number of worker threads executing the callbacks. `0` executes them inline
+        :type       workers:     integer, optional
+        :param      queue_size:  Maximum number of events waiting in each worker queue
+        :type       queue_size:  integer, optional
+        :param      ordered:     Keep the order of events with the same key
+        :type       ordered:     boolean, optional
+        :param      key:         Function returning the ordering key of an event (default : emitter or item key)
+        :type       key:         function, optional
+        :param      block:       Stop reading the stream when a queue is full. Otherwise the event is dropped
+        :type       block:       boolean, optional
         """
 
         logger.info('Ready to listen to the event stream')
-        for event in self:
-            # Trigger callback for the exact event topic
-            for callback in self.listeners.get(event.topic, []):
-                callback(event)
+        if not workers:
+            for event in self:
+                self.dispatch(event)
+            return
 
-            # Trigger callback for the event native topic
-            topic = '{category}.{verb}'.format(category=event._category, verb=event._verb)
-            for callback in self.listeners.get(topic, []):
-                callback(event)
+        self.dispatcher = EventDispatcher(self.dispatch, workers=workers, queue_size=queue_size,
+                                          ordered=ordered, key=key, block=block).start()
+        try:
+            for event in self:
+                self.dispatcher.submit(event)
+        finally:
+            self.dispatcher.stop()
 
-            # Trigger callback for the event root topic's category
-            for callback in self.listeners.get(event._category, []):
-                callback(event)
+    def dispatch(self, event):
+        """
+        Trigger the callbacks subscribed to the event topic
 
+        :param      event:  The event
+        :type       event:  :class:`~aquarium.events.Event`
+        """
+        for callback in self.router.match(event.topic):
+            callback(event)
 
-            # Trigger callback for all events
-            for callback in self.listeners.get('*', []):
-                callback(event)
+    @property
+    def router(self):
+        """
+        Get the routing of events to the subscribed callbacks, compiled again when the subscriptions change
+
+        :returns:   The router
+        :rtype:     :class:`~aquarium.events.TopicRouter`
+        """
+        router = self._router
+        if router is None:
+            router = self._router = TopicRouter(self.listeners)
+        return router
 
     def stop(self):
         """
@@ -101,7 +428,7 @@ class Events(object):
         """
         Subscribe to an event's topic and define its callback
 
-        :param      event:  The event topic. It can be a specific event (item.created.Media), a part of topic (item.created), or a wildcard (*)
+        :param      event:  The event topic. It can be a specific event (item.created.Media), a part of topic (item.created), a pattern with wildcard parts (item.*.Shot, edge.created.*), or a wildcard (*)
         :type       event:  string
         :param      callback:  The callback function
         :type       callback:  function
@@ -124,6 +451,7 @@ class Events(object):
             self.listeners[topic] = []
 
         self.listeners[topic].append(Callback)
+        self._router = None
         return Callback
 
     def unsubscribe(self, event = '*', callback = None):
@@ -141,6 +469,7 @@ class Events(object):
                 self.listeners[topic].remove(callback)
             except Exception as e:
                 logger.error('Could not remove the callback')
+            self._router = None
 
     def _iter_content(self):
         def iter():
@@ -152,26 +481,19 @@ class Events(object):
 
         return iter()
 
-    def _event_complete(self):
-        """
-        Check if the event is complete
-        """
-        return re.search(end_of_field, self.buf) is not None
-
     def __iter__(self):
         return self
 
     def __next__(self):
-        if not self.listening:
-            raise StopIteration()
         try:
             while self.listening == True:
-                while not self._event_complete():
+                event_string = self.decoder.next_message()
+                if event_string is None:
                     try:
                         next_chunk = next(self.stream_iterator)
                         if not next_chunk:
                             raise EOFError()
-                        self.buf += self.decoder.decode(next_chunk)
+                        self.decoder.feed(next_chunk)
 
                     except Exception as e:
                         logger.error(e)
@@ -180,25 +502,19 @@ class Events(object):
 
                         # The SSE spec only supports resuming from a whole message, so
                         # if we have half a message we should throw it out.
-                        head, sep, tail = self.buf.rpartition('\n')
-                        self.buf = head + sep
-                        continue
-
-                # Split the complete event (up to the end_of_field) into event_string,
-                # and retain anything after the current complete event in self.buf
-                # for next time.
-                (event_string, self.buf) = re.split(end_of_field, self.buf, maxsplit=1)
+                        self.decoder.discard()
+                    continue
+
                 event = Event.parse(event_string, self.parent)
                 if (event):
                     self.last_timestamp = event._timestamp
                     if event._retry:
                         self.wait = event._retry
                     return event
-                else:
-                    continue
         except KeyboardInterrupt:
             logger.info('Stopping the event stream due to keyboard interrupt')
-            raise StopIteration()
+
+        raise StopIteration()
 
 
 class _Callback(object):
@@ -327,10 +643,9 @@ class Event(Entity):
 
         entity_data=data.get('data')
         if entity_data:
-            self.data=DotMap(entity_data, _dynamic=(not bool(self.parent.strict_dotmap)))
+            self.data=self.wrap_data(entity_data)
 
-        topicRegex = r"^(?:custom[.])?(?P<category>\w+)([.](?P<verb>\w+))?([.](\w+))*$"
-        topicMatched = re.match(topicRegex, self.topic)
+        topicMatched = topic_pattern.match(self.topic)
         if topicMatched.group('category'):
             self._category = topicMatched.group('category')
 
@@ -358,7 +673,7 @@ class Event(Entity):
         Given a possibly-multiline string representing an SSE message, parse it
         and return a Event object.
         """
-        sse_line_pattern = re.compile('(?P<name>[^:]*):?( ?(?P<value>.*))?')
+        loads = parent.json_codec.loads if hasattr(parent, 'json_codec') else json.loads
         event = cls(parent=parent)
         for line in raw.splitlines():
             lineMatched = sse_line_pattern.match(line)
@@ -373,7 +688,7 @@ class Event(Entity):
 
             if name == 'data':
                 try:
-                    data = json.loads(value)
+                    data = loads(value)
                     event.set_data_variables(data)
                 except Exception as e:
                     logger.error(e)
@@ -427,7 +742,7 @@ class Event(Entity):
         if (context and len(context) > 0):
             return {
                 'project': self.parent.cast(context[0]['project']),
-                'path': [self.parent.cast(item) for item in context[0]['path']]
+                'path': self.parent.cast_many(context[0]['path'])
             }
         else:
             raise ValueError('The event has emittedFrom attribute, but the context could not be found')
\ No newline at end of file
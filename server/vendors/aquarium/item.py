@@ -6,6 +6,7 @@ from .tools import jsonify
 from .entity import Entity
 from .exceptions import Deprecated
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 import logging
 logger = logging.getLogger(__name__)
 
@@ -149,6 +150,60 @@ class Item(Entity):
             'POST', 'items/'+self._key+'/traverse', json=data)
         return result
 
+    def iter_traverse(self, meshql='', aliases={}, page_size=500, prefetch=False, stop_on_short_page=True):
+        """
+        Execute a traverse from the current item, page by page, and yield results lazily
+
+        The meshql must contain the `{offset},{limit}` window of the traversal, it's filled for each page.
+        Example: `# -($Child, 3)> {offset},{limit} $Shot SORT item.data.name ASC`
+
+        .. tip::
+            Use a stable `SORT` in the meshql, so items are not skipped or duplicated between two pages.
+
+        :param      meshql:              The meshql string, with `{offset}` and `{limit}` placeholders
+        :type       meshql:              string
+        :param      aliases:             The aliases used in the meshql query
+        :type       aliases:             dictionary, optional
+        :param      page_size:           Number of traversed items requested per page
+        :type       page_size:           integer, optional
+        :param      prefetch:            Request the next page while the current one is consumed
+        :type       prefetch:            boolean, optional
+        :param      stop_on_short_page:  Stop when a page returns less than `page_size` results. Set to `False` when the query aggregates results (`COLLECT`), the traversal then stops on the first empty page.
+        :type       stop_on_short_page:  boolean, optional
+
+        :returns:   Generator of item and/or edge or VIEW used in the meshql query
+        :rtype:     generator
+        """
+        if '{offset}' not in meshql or '{limit}' not in meshql:
+            raise ValueError('The meshql must contain {offset} and {limit} placeholders to be paginated')
+        if page_size <= 0:
+            raise ValueError('The page_size must be greater than 0')
+
+        def fetch(offset):
+            query=meshql.replace('{offset}', str(offset)).replace('{limit}', str(page_size))
+            return self.traverse(meshql=query, aliases=aliases)
+
+        executor=ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            offset=0
+            page=fetch(offset)
+            while page:
+                last_page=stop_on_short_page and len(page) < page_size
+                offset+=page_size
+                next_page=None
+                if executor is not None and not last_page:
+                    next_page=executor.submit(fetch, offset)
+
+                for result in page:
+                    yield result
+
+                if last_page:
+                    break
+                page=next_page.result() if next_page is not None else fetch(offset)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
     def traverse_trashed(self, meshql='', aliases={}):
         """
         Execute a traverse from the current item on trashed_items
@@ -227,7 +282,7 @@ class Item(Entity):
         result = self.do_request(
             'POST', 'items/'+self._key+'/copy', json=data)
 
-        result = [self.parent.cast(data) for data in result]
+        result = self.parent.cast_many(result)
         return result
 
     def convert_to_template(self, parent_key=''):
@@ -330,7 +385,7 @@ class Item(Entity):
 
         result = self.do_request(
             'GET', 'items/{0}/history'.format(self._key), params=params)
-        result = [self.parent.cast(data) for data in result]
+        result = self.parent.cast_many(result)
         return result
 
     def get_versions(self, populate=False):
@@ -351,7 +406,7 @@ class Item(Entity):
         """
         result = self.do_request(
             'GET', 'items/'+self._key+'/path/'+key)
-        result = [self.parent.cast(data) for data in result]
+        result = self.parent.cast_many(result)
         return result
 
     def get_permissions(self, sort=None, populate=False, offset=0, limit=50, depth=1, includeMembers=False):
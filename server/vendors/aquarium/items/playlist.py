@@ -49,7 +49,7 @@ class Playlist(Item):
         query = '# -($Child)> $Playlist VIEW item'
 
         result=self.traverse(meshql=query)
-        result = [self.parent.cast(item) for item in result]
+        result = self.parent.cast_many(result)
         return result
 
     def import_medias(self, media_paths, track=0):
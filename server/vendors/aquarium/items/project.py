@@ -25,7 +25,7 @@ class Project(Item):
 
         query.append('SORT item.data.name ASC')
         result = self.parent.query(meshql=' '.join(query))
-        result = [self.parent.cast(data) for data in result]
+        result = self.parent.cast_many(result)
         return result
 
     def get_shots(self):
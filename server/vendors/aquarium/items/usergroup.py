@@ -19,7 +19,7 @@ class Usergroup(Item):
         result = self.do_request(
             'GET', 'usergroups/'+self._key)
 
-        result = [self.parent.cast(data) for data in result]
+        result = self.parent.cast_many(result)
         return result
 
     def add_user(self, user_key=''):
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+try:
+    from collections.abc import MutableMapping, MutableSequence
+except ImportError:
+    from collections import MutableMapping, MutableSequence
+
+ENTITY_MODES=('dotmap', 'lazy')
+
+
+def wrap(value, strict=False):
+    """
+    Wrap a raw value from Aquarium API for attribute access, without copying it
+
+    :param      value:   The raw value
+    :type       value:   any
+    :param      strict:  Raise an error when accessing a missing key instead of returning None
+    :type       strict:  boolean, optional
+
+    :returns:   LazyData for dictionaries, LazyList for lists, the value itself otherwise
+    :rtype:     :class:`~aquarium.lazy.LazyData` | :class:`~aquarium.lazy.LazyList` | any
+    """
+    if type(value) is dict:
+        return LazyData(value, strict)
+    if type(value) is list:
+        return LazyList(value, strict)
+    return value
+
+
+def unwrap(value):
+    """
+    Get the raw value wrapped by :func:`~aquarium.lazy.wrap`
+    """
+    if isinstance(value, (LazyData, LazyList)):
+        return value._raw
+    return value
+
+
+class LazyData(MutableMapping):
+    """
+    This class describes a lightweight view on an entity data dictionary.
+
+    Unlike :class:`~aquarium.dotmap.DotMap`, nothing is converted when the entity is cast:
+    nested dictionaries and lists are wrapped only when they are accessed,
+    and changes are written directly in the raw dictionary.
+
+    A missing attribute returns `None`, or raises an `AttributeError` in strict mode.
+    Item access behaves like a dictionary and raises a `KeyError`.
+    """
+    __slots__=('_raw', '_strict')
+
+    def __init__(self, raw=None, strict=False):
+        object.__setattr__(self, '_raw', raw if raw is not None else {})
+        object.__setattr__(self, '_strict', strict)
+
+    def __getattr__(self, name):
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        try:
+            return wrap(self._raw[name], self._strict)
+        except KeyError:
+            if self._strict:
+                raise AttributeError(name)
+            return None
+
+    def __setattr__(self, name, value):
+        self._raw[name]=unwrap(value)
+
+    def __delattr__(self, name):
+        try:
+            del self._raw[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key):
+        return wrap(self._raw[key], self._strict)
+
+    def __setitem__(self, key, value):
+        self._raw[key]=unwrap(value)
+
+    def __delitem__(self, key):
+        del self._raw[key]
+
+    def __contains__(self, key):
+        return key in self._raw
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __bool__(self):
+        return bool(self._raw)
+
+    __nonzero__=__bool__
+
+    def __eq__(self, other):
+        return self._raw == unwrap(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'LazyData(%r)' % (self._raw,)
+
+    def toDict(self):
+        """
+        Get the raw dictionary
+
+        :returns:   The wrapped dictionary
+        :rtype:     dictionary
+        """
+        return self._raw
+
+    def to_dict(self):
+        """
+        Alias of :func:`~aquarium.lazy.LazyData.toDict`
+        """
+        return self._raw
+
+
+class LazyList(MutableSequence):
+    """
+    This class describes a lightweight view on a list of an entity data.
+
+    Dictionaries of the list are wrapped as :class:`~aquarium.lazy.LazyData` when they are accessed.
+    """
+    __slots__=('_raw', '_strict')
+
+    def __init__(self, raw=None, strict=False):
+        self._raw=raw if raw is not None else []
+        self._strict=strict
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyList(self._raw[index], self._strict)
+        return wrap(self._raw[index], self._strict)
+
+    def __setitem__(self, index, value):
+        self._raw[index]=unwrap(value)
+
+    def __delitem__(self, index):
+        del self._raw[index]
+
+    def __iter__(self):
+        strict=self._strict
+        for value in self._raw:
+            yield wrap(value, strict)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __contains__(self, value):
+        return unwrap(value) in self._raw
+
+    def __eq__(self, other):
+        return self._raw == unwrap(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'LazyList(%r)' % (self._raw,)
+
+    def insert(self, index, value):
+        self._raw.insert(index, unwrap(value))
+
+    def toList(self):
+        """
+        Get the raw list
+
+        :returns:   The wrapped list
+        :rtype:     list
+        """
+        return self._raw
@@ -2,6 +2,11 @@
 import pprint
 import logging
 logger=logging.getLogger(__name__)
+import sys
+if sys.version_info[0] > 2:
+    from urllib.parse import urljoin
+else:
+    from urlparse import urljoin
 from .exceptions import RequestError, AuthentificationError,\
                         AutorisationError, PathNotFoundError, \
                         MethodNotAllowed, ConflictError, UploadExceedLimit, InternalError
@@ -10,6 +15,31 @@ def pretty_print_format(data={}, indent=8, width=80, depth=10):
     dict_string=pprint.pformat(data, indent=indent, width=width, depth=depth)
     return dict_string
 
+def build_url(api_url='', api_version='v1', endpoint=None):
+    """
+    Build the URL of an API endpoint
+
+    :param      api_url:      The URL of the API
+    :type       api_url:      string
+    :param      api_version:  The API version
+    :type       api_version:  string
+    :param      endpoint:     The API endpoint. Files endpoints (`/files/...`) are not versioned
+    :type       endpoint:     string, optional
+
+    :returns:   The URL
+    :rtype:     string
+    """
+    if endpoint is None:
+        return urljoin(api_url, api_version)
+
+    if endpoint.find('/files/') >= 0:
+        return urljoin(api_url, endpoint)
+
+    return urljoin(api_url, '{api_version}/{endpoint}'.format(
+        api_version=api_version,
+        endpoint=endpoint
+    ))
+
 def to_string_url(value=None):
     """
     Convert value to string url convention
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import random
+import socket
+import time
+from email.utils import parsedate_to_datetime
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import logging
+logger=logging.getLogger(__name__)
+
+RETRY_STATUSES=frozenset([429, 500, 502, 503, 504])
+IDEMPOTENT_METHODS=frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'])
+
+
+class AquariumRetry(Retry):
+    """
+    This class describes the retry policy used by the Aquarium transport.
+
+    It extends urllib3 `Retry` with a cap and a random jitter on the exponential backoff,
+    and always retries `429 Too Many Requests` responses whatever the HTTP verb is,
+    as the server refused the request before processing it.
+
+    :param max_backoff: Maximum number of seconds to wait between two attempts
+    :type max_backoff: float, optional
+    :param jitter: Maximum random number of seconds added to each backoff
+    :type jitter: float, optional
+    """
+
+    def __init__(self, max_backoff=30, jitter=0.0, **kwargs):
+        super(AquariumRetry, self).__init__(**kwargs)
+        self.max_backoff=max_backoff
+        self.jitter=jitter
+
+    def new(self, **kwargs):
+        retry=super(AquariumRetry, self).new(**kwargs)
+        retry.max_backoff=self.max_backoff
+        retry.jitter=self.jitter
+        return retry
+
+    def get_backoff_time(self):
+        backoff=min(super(AquariumRetry, self).get_backoff_time(), self.max_backoff)
+        if backoff <= 0 or not self.jitter:
+            return backoff
+
+        return backoff + random.uniform(0, self.jitter)
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429 and self.total:
+            return True
+
+        return super(AquariumRetry, self).is_retry(method, status_code, has_retry_after)
+
+
+class AquariumAdapter(HTTPAdapter):
+    """
+    This class describes the HTTP adapter mounted on the Aquarium session.
+
+    It configures the connection pool per host and TCP keep-alive on pooled sockets.
+
+    :param keep_alive: Enable TCP keep-alive probes on pooled connections
+    :type keep_alive: boolean, optional
+    :param keep_alive_idle: Seconds of inactivity before the first keep-alive probe
+    :type keep_alive_idle: integer, optional
+    :param keep_alive_interval: Seconds between two keep-alive probes
+    :type keep_alive_interval: integer, optional
+    """
+
+    def __init__(self, keep_alive=True, keep_alive_idle=60, keep_alive_interval=15, **kwargs):
+        self.keep_alive=keep_alive
+        self.keep_alive_idle=keep_alive_idle
+        self.keep_alive_interval=keep_alive_interval
+        super(AquariumAdapter, self).__init__(**kwargs)
+
+    def _socket_options(self):
+        options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+        if not self.keep_alive:
+            return options
+
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # TCP_KEEPIDLE and TCP_KEEPINTVL are not available on every platform
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keep_alive_idle))
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.keep_alive_interval))
+        return options
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', self._socket_options())
+        return super(AquariumAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+def create_retry(max_retries=3, backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5,
+                 retry_statuses=RETRY_STATUSES, retry_methods=IDEMPOTENT_METHODS):
+    """
+    Create the retry policy of the Aquarium transport
+
+    :param      max_retries:     Maximum number of retries. `0` disables retries
+    :type       max_retries:     integer
+    :param      backoff_factor:  Exponential backoff factor, in seconds
+    :type       backoff_factor:  float
+    :param      backoff_max:     Maximum backoff between two attempts, in seconds
+    :type       backoff_max:     float
+    :param      backoff_jitter:  Maximum random number of seconds added to each backoff
+    :type       backoff_jitter:  float
+    :param      retry_statuses:  HTTP status codes to retry
+    :type       retry_statuses:  iterable of integer
+    :param      retry_methods:   HTTP verbs retried on connection errors and on `retry_statuses`
+    :type       retry_methods:   iterable of string
+
+    :returns:   The retry policy
+    :rtype:     :class:`~aquarium.transport.AquariumRetry`
+    """
+    return AquariumRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        max_backoff=backoff_max,
+        jitter=backoff_jitter,
+        status_forcelist=frozenset(retry_statuses),
+        allowed_methods=frozenset(method.upper() for method in retry_methods),
+        respect_retry_after_header=True,
+        # Let evaluate() raise the Aquarium exception of the last response
+        raise_on_status=False,
+    )
+
+
+def resolve_timeout(endpoint, timeout=None, timeouts=None):
+    """
+    Get the timeout to use for an API endpoint
+
+    The longest matching endpoint prefix of `timeouts` wins, otherwise `timeout` is used.
+
+    :param      endpoint:  The API endpoint (Example: `items/123/traverse`)
+    :type       endpoint:  string
+    :param      timeout:   The default timeout
+    :type       timeout:   float or tuple (connect, read), optional
+    :param      timeouts:  Timeouts by endpoint prefix
+    :type       timeouts:  dictionary, optional
+
+    :returns:   The timeout
+    :rtype:     float or tuple (connect, read) or None
+    """
+    if timeouts and endpoint:
+        endpoint=endpoint.lstrip('/')
+        matched=None
+        for prefix in timeouts:
+            if endpoint.startswith(prefix.lstrip('/')) and (matched is None or len(prefix) > len(matched)):
+                matched=prefix
+        if matched is not None:
+            return timeouts[matched]
+
+    return timeout
+
+
+def compute_backoff(retries, backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5):
+    """
+    Compute the exponential backoff before a new attempt, as :class:`~aquarium.transport.AquariumRetry` does
+
+    :param      retries:         The number of attempts already retried
+    :type       retries:         integer
+    :param      backoff_factor:  Exponential backoff factor, in seconds
+    :type       backoff_factor:  float
+    :param      backoff_max:     Maximum backoff between two attempts, in seconds
+    :type       backoff_max:     float
+    :param      backoff_jitter:  Maximum random number of seconds added to the backoff
+    :type       backoff_jitter:  float
+
+    :returns:   The number of seconds to wait
+    :rtype:     float
+    """
+    if retries <= 0:
+        return 0
+
+    backoff=min(backoff_factor * (2 ** (retries - 1)), backoff_max)
+    if backoff_jitter:
+        backoff+=random.uniform(0, backoff_jitter)
+    return backoff
+
+
+def parse_retry_after(value):
+    """
+    Parse a `Retry-After` header value
+
+    :param      value:  The header value, as seconds or HTTP date
+    :type       value:  string
+
+    :returns:   The number of seconds to wait, or None if the value is invalid
+    :rtype:     float
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_date=parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_date is None:
+        return None
+    return max(retry_date.timestamp() - time.time(), 0)
@@ -1 +1,3 @@
-from .aquarium_services import AquariumServices, connect_to_ayon, register_signals
\ No newline at end of file
+from .aquarium_services import AquariumServices, LEECH_TOPICS, connect_to_ayon, register_signals
+from .dispatcher import EventDispatcher
+from .payloads import compact_event, expand_payload, is_compact
@@ -17,6 +17,26 @@ from ayon_api import (
 
 log = logging.getLogger(__name__)
 
+# Aquarium event topics leeched to AYON, the processor has a handler for each of them
+LEECH_TOPICS = (
+    "item.updated.Project",
+    "item.created.Asset",
+    "item.updated.Asset",
+    "item.created.Shot",
+    "item.updated.Shot",
+    "item.created.Sequence",
+    "item.updated.Sequence",
+    "item.created.Episode",
+    "item.updated.Episode",
+    "item.created.Task",
+    "item.updated.Task",
+    "user.assigned",
+    "user.unassigned",
+    "edge.created.Child",
+    "edge.updated.Child",
+    "edge.deleted.Child",
+)
+
 def get_service_label() -> str:
     return " ".join([
         str(get_service_addon_name()),
@@ -164,6 +184,8 @@ class AquariumServices:
         if self.listener is not None and self.listenning:
             self.listener.stop()
 
+        if self.leecher:
+            self.leecher.stop()
         if self.processor:
             self.processor.stop()
         self.log.info("Termination finished.")
\ No newline at end of file
@@ -0,0 +1,170 @@
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+# Same as `default_event_key` and `EventDispatcher` of the client vendored by the addon
+# (server/vendors/aquarium/events.py), plus batches. The services use the PyPI client,
+# which has none, and their images don't include the addon. Keep both in sync.
+
+
+def default_event_key(event) -> Any:
+    """Order events by the entity which emitted them, or by the item of their data."""
+    if event.emittedFrom:
+        return event.emittedFrom
+
+    data = getattr(event, "data", None)
+    item = data.get("item") if data else None
+    if item:
+        return item.get("_key") or event._key
+    return event._key
+
+
+class EventDispatcher:
+    """
+    Execute Aquarium events callbacks with a pool of worker threads.
+
+    The Aquarium events listener runs callbacks on the thread reading the stream.
+    Subscribing `submit` instead queues the events in bounded queues, so a slow
+    callback doesn't hold the stream. When ordered, events with the same key are
+    always executed by the same worker, in the order they were received.
+
+    With a `batch_size` over 1, each worker calls the callback with a list of events,
+    flushed every `batch_size` events or `batch_interval` seconds after the first one.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Any], None],
+        workers: int = 4,
+        queue_size: int = 1000,
+        ordered: bool = True,
+        key: Optional[Callable[[Any], Any]] = None,
+        block: bool = True,
+        batch_size: int = 1,
+        batch_interval: float = 0.2,
+    ):
+        self.callback = callback
+        self.workers = max(int(workers), 1)
+        self.ordered = ordered
+        self.key = key or default_event_key
+        self.block = block
+        self.batch_size = max(int(batch_size), 1)
+        self.batch_interval = batch_interval
+
+        self.dispatched = 0
+        self.batches = 0
+        self.errors = 0
+        self.blocked = 0
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._queues = [
+            queue.Queue(maxsize=queue_size)
+            for _ in range(self.workers if ordered else 1)
+        ]
+        self._threads = []
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue_depth,
+            "dispatched": self.dispatched,
+            "batches": self.batches,
+            "errors": self.errors,
+            "blocked": self.blocked,
+            "dropped": self.dropped,
+        }
+
+    def start(self) -> "EventDispatcher":
+        for index in range(self.workers):
+            q = self._queues[index % len(self._queues)]
+            thread = threading.Thread(
+                target=self._work,
+                args=(q,),
+                name=f"aquarium-dispatch-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, event) -> bool:
+        """Queue an event, return False if it was dropped."""
+        q = self._queues[0]
+        if self.ordered:
+            q = self._queues[hash(self.key(event)) % len(self._queues)]
+
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            if not self.block:
+                self.dropped += 1
+                log.warning(f"Dispatch queue is full, drop event {event.topic} #{event._key}")
+                return False
+
+            self.blocked += 1
+            q.put(event)
+        return True
+
+    def stop(self, wait: bool = True):
+        """Stop the workers once the queued events are executed."""
+        for index in range(len(self._threads)):
+            self._queues[index % len(self._queues)].put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def _work(self, q: queue.Queue):
+        while True:
+            event = q.get()
+            if event is None:
+                return
+
+            if self.batch_size == 1:
+                self._dispatch(event, 1)
+                continue
+
+            batch, stopped = self._fill_batch(q, [event])
+            self._dispatch(batch, len(batch))
+            if stopped:
+                return
+
+    def _fill_batch(self, q: queue.Queue, batch: list):
+        """Wait for more events, until the batch is full or its interval is elapsed."""
+        deadline = time.monotonic() + self.batch_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                event = q.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if event is None:
+                return batch, True
+            batch.append(event)
+        return batch, False
+
+    def _dispatch(self, events, count: int):
+        try:
+            self.callback(events)
+        except Exception:
+            if isinstance(events, list):
+                log.exception(f"Failed to dispatch a batch of {count} events")
+            elif hasattr(events, "topic"):
+                log.exception(f"Failed to dispatch event {events.topic} #{events._key}")
+            else:
+                log.exception("Failed to dispatch an event")
+            with self._lock:
+                self.errors += count
+        with self._lock:
+            self.dispatched += count
+            self.batches += 1
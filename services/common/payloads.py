@@ -0,0 +1,78 @@
+import json
+import zlib
+import base64
+from typing import Any
+
+# Version of the compact leech payload schema
+COMPACT_VERSION = 1
+# Fields kept from the entities referenced by an event data
+ENTITY_FIELDS = ("_key", "_id", "type", "_from", "_to")
+EVENT_FIELDS = (
+    "_key",
+    "_id",
+    "topic",
+    "type",
+    "_timestamp",
+    "createdAt",
+    "createdBy",
+    "emittedFrom",
+)
+
+
+def _to_plain(value: Any) -> Any:
+    if hasattr(value, "toDict"):
+        return value.toDict()
+    return value
+
+
+def compact_entity(entity: dict) -> dict:
+    """Keep the reference of an entity, and its name for logs."""
+    compacted = {field: entity[field] for field in ENTITY_FIELDS if field in entity}
+    name = (entity.get("data") or {}).get("name")
+    if name is not None:
+        compacted["data"] = {"name": name}
+    return compacted
+
+
+def compact_event(event, compress_threshold: int = 4096) -> dict:
+    """
+    Create the compact payload of an Aquarium event stored on AYON.
+
+    Only the event identity and the references of the entities in its data are kept.
+    Other data values (changed fields) are kept as is. Payloads larger than
+    `compress_threshold` bytes are zlib compressed. Set it to 0 to disable compression.
+    """
+    raw = event.to_dict()
+    payload = {field: raw.get(field) for field in EVENT_FIELDS}
+
+    data = {}
+    for name, value in (_to_plain(raw.get("data")) or {}).items():
+        value = _to_plain(value)
+        if isinstance(value, dict) and "_id" in value:
+            data[name] = compact_entity(value)
+        else:
+            data[name] = value
+    payload["data"] = data
+    payload["compact"] = COMPACT_VERSION
+
+    if compress_threshold:
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        if len(body) > compress_threshold:
+            return {
+                "compact": COMPACT_VERSION,
+                "_key": payload["_key"],
+                "topic": payload["topic"],
+                "zlib": base64.b64encode(zlib.compress(body)).decode("ascii"),
+            }
+    return payload
+
+
+def expand_payload(payload: dict) -> dict:
+    """Decompress a leech payload, full `event.to_dict()` payloads are returned as is."""
+    if "zlib" in payload:
+        return json.loads(zlib.decompress(base64.b64decode(payload["zlib"])))
+    return payload
+
+
+def is_compact(payload: dict) -> bool:
+    return bool(payload.get("compact"))
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# An event received less than CATCH_UP_LAG seconds after its creation is live
+CATCH_UP_LAG = 5
+
+
+def get_event_lag(event) -> Optional[float]:
+    """Seconds between the creation of an Aquarium event and now."""
+    created_at = getattr(event, "createdAt", None)
+    if not created_at:
+        return None
+
+    try:
+        created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return max((datetime.now(timezone.utc) - created).total_seconds(), 0)
+
+
+class Checkpoint:
+    """
+    Durable last-event-id of the Aquarium event stream.
+
+    Events are tracked in the order they are received. As workers can finish them
+    out of order, the checkpoint only moves forward to the last event whose
+    predecessors are all stored on AYON, and it's written at most every
+    `flush_interval` seconds. On start, the leecher resumes the stream from it.
+
+    While catching up after a restart, replay lag (age of the received events) is tracked.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.last_event_id: Optional[str] = None
+
+        self.replayed = 0
+        self.lag: Optional[float] = None
+        self.catching_up = False
+        self._resumed_at: Optional[float] = None
+
+        self._pending: "OrderedDict[str, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._written_id: Optional[str] = None
+        self._written_at = 0.0
+
+    def load(self) -> Optional[str]:
+        """Read the checkpoint, return the last event id to resume from."""
+        try:
+            with open(self.path, "r") as f:
+                self.last_event_id = json.load(f).get("lastEventId")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            log.exception(f"Failed to read the checkpoint {self.path}")
+            return None
+
+        self._written_id = self.last_event_id
+        if self.last_event_id:
+            self.catching_up = True
+            self._resumed_at = time.time()
+            log.info(f"Resume Aquarium events from #{self.last_event_id}")
+        return self.last_event_id
+
+    def received(self, event):
+        """Track an event read from the stream, before it's dispatched."""
+        event_id = event._timestamp
+        if not event_id:
+            return
+
+        self.lag = get_event_lag(event)
+        if self.catching_up:
+            self.replayed += 1
+            if self.lag is not None and self.lag < CATCH_UP_LAG:
+                self.catching_up = False
+                log.info(
+                    f"Caught up with Aquarium events: {self.replayed} events"
+                    f" replayed in {time.time() - self._resumed_at:.1f}s"
+                )
+
+        with self._lock:
+            self._pending[event_id] = False
+
+    def done(self, event):
+        """Mark an event as dispatched, and move the checkpoint forward."""
+        event_id = event._timestamp
+        if not event_id:
+            return
+
+        with self._lock:
+            if event_id not in self._pending:
+                return
+            self._pending[event_id] = True
+            while self._pending:
+                oldest_id, oldest_done = next(iter(self._pending.items()))
+                if not oldest_done:
+                    break
+                self._pending.popitem(last=False)
+                self.last_event_id = oldest_id
+
+        if time.time() - self._written_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the checkpoint, atomically."""
+        with self._lock:
+            event_id = self.last_event_id
+            if event_id is None or event_id == self._written_id:
+                return
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump({"lastEventId": event_id, "updatedAt": time.time()}, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError:
+                log.exception(f"Failed to write the checkpoint {self.path}")
+                return
+
+            self._written_id = event_id
+            self._written_at = time.time()
+
+    def stats(self) -> dict:
+        return {
+            "lastEventId": self.last_event_id,
+            "pending": len(self._pending),
+            "lag": None if self.lag is None else round(self.lag, 3),
+            "catchingUp": self.catching_up,
+            "replayed": self.replayed,
+        }
+
+    def stop(self):
+        self.flush()
@@ -0,0 +1,115 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+
+def get_item_key(event) -> Any:
+    """Key of the item an event is about."""
+    item = event.data.get("item") if event.data else None
+    if item and item.get("_key"):
+        return item.get("_key")
+    return event.emittedFrom or event._key
+
+
+class Coalescer:
+    """
+    Collapse bursts of updates of the same item.
+
+    An update event (`*.updated.*`) is held for `window` seconds. If the same item
+    is updated again with the same topic meanwhile, the held event is replaced by
+    the latest one and counted as collapsed. Any other event of the item (created,
+    deleted, ...) first releases its held updates, so the order of an item events
+    is kept. Held events are released when their window is elapsed.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Any], Any],
+        window: float = 0,
+        on_collapse: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.emit = emit
+        self.window = window
+        self.on_collapse = on_collapse
+
+        self.received = 0
+        self.collapsed = 0
+
+        # (item key, topic) -> (deadline, event), in deadline order
+        self._held: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "collapsed": self.collapsed,
+            "held": len(self._held),
+        }
+
+    def start(self) -> "Coalescer":
+        if self.enabled:
+            self._running = True
+            self._thread = threading.Thread(target=self._release_expired, name="aquarium-coalescer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, event):
+        self.received += 1
+        if not self.enabled:
+            self.emit(event)
+            return
+
+        item_key = get_item_key(event)
+        with self._lock:
+            if event._verb == "updated":
+                key = (item_key, event.topic)
+                held = self._held.get(key)
+                if held is not None:
+                    # Keep the deadline of the first update, so a continuous burst is still released
+                    self._held[key] = (held[0], event)
+                    self.collapsed += 1
+                    if self.on_collapse:
+                        self.on_collapse(held[1])
+                    return
+
+                self._held[key] = (time.monotonic() + self.window, event)
+                self._lock.notify()
+                return
+
+            for key in [key for key in self._held if key[0] == item_key]:
+                self.emit(self._held.pop(key)[1])
+            self.emit(event)
+
+    def stop(self):
+        """Release all held events."""
+        with self._lock:
+            self._running = False
+            while self._held:
+                self.emit(self._held.popitem(last=False)[1][1])
+            self._lock.notify()
+
+    def _release_expired(self):
+        with self._lock:
+            while self._running:
+                now = time.monotonic()
+                while self._held:
+                    key, (deadline, event) = next(iter(self._held.items()))
+                    if deadline > now:
+                        break
+                    del self._held[key]
+                    self.emit(event)
+
+                timeout = None
+                if self._held:
+                    timeout = next(iter(self._held.values()))[0] - now
+                self._lock.wait(timeout)
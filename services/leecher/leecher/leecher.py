@@ -1,3 +1,4 @@
+import os
 import sys
 import time
 import signal
@@ -9,11 +10,33 @@ from typing import Any, Union
 from aquarium import Aquarium
 from aquarium import exceptions
 
-from aquarium_common import AquariumServices, connect_to_ayon, register_signals
+from aquarium_common import (
+    AquariumServices,
+    EventDispatcher,
+    LEECH_TOPICS,
+    compact_event,
+    connect_to_ayon,
+    register_signals,
+)
 
 import ayon_api
 
+from .checkpoint import Checkpoint
+from .coalescer import Coalescer
+from .spool import Spool
+from .projects import PairedProjects
+
 IGNORE_TOPICS = {}
+STATS_INTERVAL = 60
+CHECKPOINT_PATH = os.environ.get("AQUARIUM_LEECHER_CHECKPOINT", "data/checkpoint.json")
+SPOOL_PATH = os.environ.get("AQUARIUM_LEECHER_SPOOL", "data/spool.sqlite3")
+# Spooled events kept in memory, so the drain doesn't decode them again
+LIVE_EVENTS_MAX = 10000
+RETRY_DELAY_MAX = 60
+# Client errors retried along with the server errors and connection errors, other ones are rejected
+RETRIED_STATUSES = (408, 429)
+# Only the topics handled by the processor are leeched
+LEECHED_TOPICS = frozenset(LEECH_TOPICS)
 
 log = logging.getLogger(__name__)
 _AQS = AquariumServices()
@@ -23,19 +46,179 @@ def create_event_description(event):
     return "Received {topic} #{_key}".format(topic=event.topic, _key=event._key)
 
 
-def callback(event):
-    if event.topic in IGNORE_TOPICS:
-        return
-
-    ayon_api.dispatch_event(
-        "aquarium.leech",
-        sender=ayon_api.ServiceContext.service_name,
-        event_hash=event._key,
-        description="Received {topic} #{_key}".format(topic=event.topic, _key=event._key),
-        payload=event.to_dict(),
-    )
-
-    log.info(f"Event stored {event.topic}")
+class AquariumLeecher():
+    """
+        Aquarium leecher stores Aquarium events on AYON as `aquarium.leech` events.
+        Events are first written to an on-disk spool, and the last event spooled is
+        checkpointed so the stream resumes from it after a restart. A drain thread
+        forwards spooled events to a pool of workers, which send them to AYON and retry
+        with backoff until AYON acknowledges them, or rejects them with a client error.
+        The stream is never held by AYON.
+    """
+
+    def __init__(self, parent: "AquariumServices"):
+        self._AQS = parent
+
+        addon_name = ayon_api.get_service_addon_name()
+        addon_version = ayon_api.get_service_addon_version()
+        self.entrypoint = f"/addons/{addon_name}/{addon_version}"
+
+        settings = ayon_api.get_service_addon_settings()["services"].get("leecher", {})
+        batch_size = settings.get("batch_size", 50)
+        self.compact_payloads = settings.get("compact_payloads", True)
+        self.compress_threshold = settings.get("compress_threshold", 4096)
+        self.checkpoint = Checkpoint(CHECKPOINT_PATH)
+        self.spool = Spool(SPOOL_PATH)
+        self.projects = PairedProjects(self.entrypoint)
+        self.retries = 0
+        self.rejected = 0
+        self.dispatcher = EventDispatcher(
+            self.leech_batch if batch_size > 1 else self.leech,
+            workers=settings.get("workers", 4),
+            queue_size=settings.get("queue_size", 1000),
+            batch_size=batch_size,
+            batch_interval=settings.get("batch_interval_ms", 200) / 1000,
+        )
+        # Collapsed updates are superseded by a later event, they count as stored
+        self.coalescer = Coalescer(
+            self.dispatcher.submit,
+            window=settings.get("coalesce_window_ms", 0) / 1000,
+            on_collapse=lambda event: self.spool.ack([event._key]),
+        )
+
+        self._live = {}
+        self._spooled = threading.Condition()
+        self._stopped = threading.Event()
+        self._drain_thread = threading.Thread(target=self.drain, name="aquarium-drain", daemon=True)
+
+    def start(self):
+        self.checkpoint.load()
+        self.dispatcher.start()
+        self.coalescer.start()
+        self._drain_thread.start()
+        threading.Thread(target=self.log_stats, daemon=True).start()
+
+    def resume(self):
+        """Resume the event stream from the checkpoint, unless it's already read in this process."""
+        if not self._AQS.aq.events.last_timestamp:
+            self._AQS.aq.events.last_timestamp = self.checkpoint.last_event_id
+
+    def receive(self, event):
+        """Spool an event read from the stream, it's checkpointed once spooled."""
+        if event.topic not in LEECHED_TOPICS:
+            return
+
+        # Events are read in order, pairing changes are applied before the next events are leeched
+        self.projects.track(event)
+        self.checkpoint.received(event)
+        with self._spooled:
+            spool_id = self.spool.append(event)
+            if len(self._live) < LIVE_EVENTS_MAX:
+                self._live[spool_id] = event
+            self._spooled.notify()
+        self.checkpoint.done(event)
+
+    def drain(self):
+        """Forward spooled events to the workers, starting with the ones left by a previous run."""
+        cursor = 0
+        while not self._stopped.is_set():
+            rows = self.spool.read(after=cursor)
+            if not rows:
+                with self._spooled:
+                    self._spooled.wait(1)
+                continue
+
+            for spool_id, payload in rows:
+                with self._spooled:
+                    event = self._live.pop(spool_id, None)
+                if event is None:
+                    event = self._AQS.aq.event(payload)
+                self.coalescer.submit(event)
+                cursor = spool_id
+
+    def create_payload(self, event) -> dict:
+        """Payload of the AYON event, the processor reads items from Aquarium anyway."""
+        if self.compact_payloads:
+            payload = compact_event(event, self.compress_threshold)
+        else:
+            payload = event.to_dict()
+
+        # The processor orders the events of a project, already resolved to filter unpaired projects
+        project_key = self.projects.get_project_key(event, fetch=False)
+        if project_key:
+            payload["aquariumProjectKey"] = project_key
+        return payload
+
+    def leech(self, event):
+        self.leech_batch([event])
+
+    def leech_batch(self, events: list):
+        """
+        Store a batch of events on AYON in a single request, retried until AYON acknowledges it.
+        A batch rejected by AYON (client error) is logged and dropped, it would be rejected again.
+        """
+        # Events of unpaired projects are dropped before reaching the AYON events table
+        batch = [
+            {
+                "hash": event._key,
+                "description": create_event_description(event),
+                "payload": self.create_payload(event),
+            }
+            for event in events
+            if event.topic not in IGNORE_TOPICS and self.projects.accept(event)
+        ]
+
+        delay = 1
+        while batch:
+            status = None
+            try:
+                response = ayon_api.post(
+                    f"{self.entrypoint}/events/leech",
+                    sender=ayon_api.ServiceContext.service_name,
+                    events=batch,
+                )
+                status = response.status_code
+                response.raise_for_status()
+                log.info(f"Events stored {len(batch)}, {response.data.get('duplicates', 0)} already stored")
+                break
+            except Exception as e:
+                # No status when the request failed, connection errors are answered as 500 by ayon_api
+                if status is not None and 400 <= status < 500 and status not in RETRIED_STATUSES:
+                    self.rejected += len(batch)
+                    keys = ", ".join(item["hash"] for item in batch)
+                    log.error(f"AYON rejected {len(batch)} events ({status}), dropped: {e}\nEvents: {keys}")
+                    break
+                if self._stopped.is_set():
+                    # Kept in the spool, for the next start
+                    log.warning(f"Failed to store {len(batch)} events on AYON before stopping: {e}")
+                    return
+                self.retries += 1
+                log.warning(f"Failed to store {len(batch)} events on AYON, retry in {delay}s: {e}")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, RETRY_DELAY_MAX)
+
+        self.spool.ack(event._key for event in events)
+
+    def log_stats(self):
+        while True:
+            time.sleep(STATS_INTERVAL)
+            log.info(f"Dispatch stats: {self.dispatcher.stats()}")
+            log.info(f"Checkpoint stats: {self.checkpoint.stats()}")
+            log.info(f"Projects stats: {self.projects.stats()}")
+            log.info(f"Spool stats: {{'spooled': {len(self.spool)}, 'retries': {self.retries}, 'rejected': {self.rejected}}}")
+            if self.coalescer.enabled:
+                log.info(f"Coalescing stats: {self.coalescer.stats()}")
+
+    def stop(self):
+        # Held and queued events are sent once, the others stay in the spool
+        self._stopped.set()
+        with self._spooled:
+            self._spooled.notify()
+        self._drain_thread.join()
+        self.coalescer.stop()
+        self.dispatcher.stop()
+        self.spool.close()
+        self.checkpoint.stop()
 
 
 def main():
@@ -44,6 +227,10 @@ def main():
     connect_to_ayon()
     register_signals(_AQS)
 
+    # Events are sent to AYON by workers, so a slow AYON server doesn't hold the Aquarium stream
+    _AQS.leecher = AquariumLeecher(_AQS)
+    _AQS.leecher.start()
+
     while not _AQS.connected:
         _AQS.connect()
         if _AQS.connected is False:
@@ -51,8 +238,11 @@ def main():
             continue
 
         _AQS.session_fail_logged = False
+        _AQS.leecher.resume()
         _AQS.listen()
 
         if _AQS.listener is not None:
-            _AQS.listener.subscribe("*", callback)
+            # The PyPI client calls exact and `category.verb` subscriptions both for `user.assigned`,
+            # so all events are received once and filtered by topic
+            _AQS.listener.subscribe("*", _AQS.leecher.receive)
             _AQS.listener.start()
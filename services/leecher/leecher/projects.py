@@ -0,0 +1,208 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import ayon_api
+
+log = logging.getLogger(__name__)
+
+# Project of an item, from its first parent
+PROJECT_QUERY = "# <($Child, 10)- 0,1 item.type IN ['Project'] AND path.vertices[*].type NONE == 'User' SORT null VIEW item._key"
+
+
+def get_edge_keys(event) -> list:
+    """Keys of the child and the parent of an edge event, the ones found."""
+    for value in (event.data or {}).values():
+        if isinstance(value, dict):
+            edge_ids = (value.get("_to"), value.get("_from"))
+        else:
+            edge_ids = (getattr(value, "_to", None), getattr(value, "_from", None))
+        keys = [edge_id.split("/")[-1] for edge_id in edge_ids if isinstance(edge_id, str) and edge_id]
+        if keys:
+            return keys
+    return []
+
+
+class PairedProjects:
+    """
+    Filter out the events of Aquarium projects which are not paired with AYON.
+
+    Paired projects are read from the addon `/projects/pair?paired=true` endpoint and refreshed
+    every `ttl` seconds. Pairing a project writes its AYON name on the Aquarium project, so
+    `item.updated.Project` events read from the stream refresh them before the next events.
+    An event of an unknown project also refreshes them, at most once per `unknown_ttl`
+    seconds, before it's dropped. The project of an event is resolved from a cache of
+    item key -> project key, filled with the whole context path of each event resolved
+    with `get_context()`, so later events of the item or of its parents need no request.
+    Edge events are resolved from their child or parent item.
+
+    When the paired projects or the project of an event can't be read, the event is kept.
+    """
+
+    def __init__(self, entrypoint: str, ttl: float = 60, unknown_ttl: float = 5, cache_size: int = 100000):
+        self.entrypoint = entrypoint
+        self.ttl = ttl
+        self.unknown_ttl = unknown_ttl
+        self.cache_size = cache_size
+
+        self.kept = 0
+        self.dropped = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._paired: Optional[set] = None
+        self._refreshed_at = 0.0
+        self._invalidated_at = 0.0
+        self._projects: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            "paired": None if self._paired is None else len(self._paired),
+            "kept": self.kept,
+            "dropped": self.dropped,
+            "cached": len(self._projects),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def get_paired(self, max_age: Optional[float] = None) -> Optional[set]:
+        """Paired project keys, refreshed when older than `max_age` (default `ttl`) seconds."""
+        max_age = self.ttl if max_age is None else max_age
+        if not self._is_stale(max_age):
+            return self._paired
+
+        with self._lock:
+            if not self._is_stale(max_age):
+                return self._paired
+            started = time.time()
+            try:
+                response = ayon_api.get(f"{self.entrypoint}/projects/pair", paired=True)
+                response.raise_for_status()
+                self._paired = {
+                    project["aquariumProjectKey"]
+                    for project in response.data
+                    if project.get("aquariumProjectKey")
+                }
+            except Exception as e:
+                log.warning(f"Failed to refresh paired projects: {e}")
+            # A refresh started before an invalidation is stale
+            self._refreshed_at = started
+        return self._paired
+
+    def _is_stale(self, max_age: float) -> bool:
+        return time.time() - self._refreshed_at >= max_age or self._refreshed_at <= self._invalidated_at
+
+    def track(self, event):
+        """Refresh the paired projects before the next event, if an event read from the stream may change them."""
+        if event.topic == "item.updated.Project":
+            self._invalidated_at = time.time()
+
+    def get_project_key(self, event, fetch: bool = True) -> Optional[str]:
+        """Resolve the project of an event, None if it's not in a project or not cached and `fetch` is False."""
+        if event.topic.startswith("edge."):
+            return self.get_edge_project_key(event, fetch)
+
+        item = event.data.get("item") if event.data else None
+        if item and item.get("type") == "Project":
+            return item.get("_key")
+
+        item_key = item.get("_key") if item else None
+        if not item_key and event.emittedFrom:
+            item_key = event.emittedFrom.split("/")[-1]
+
+        if item_key:
+            project_key = self._projects.get(item_key)
+            if project_key is not None:
+                if fetch:
+                    self.hits += 1
+                return project_key
+
+        if not fetch:
+            return None
+        self.misses += 1
+        try:
+            context = event.get_context()
+        except ValueError:
+            return None
+
+        project_key = context["project"]._key
+        with self._lock:
+            for vertex in context["path"]:
+                self._cache(vertex._key, project_key)
+            if item_key:
+                self._cache(item_key, project_key)
+        return project_key
+
+    def get_edge_project_key(self, event, fetch: bool = True) -> Optional[str]:
+        """
+        Resolve the project of an edge event from its child, or its parent.
+        Hierarchy changes are ordered with the events of the items of their project.
+        """
+        keys = get_edge_keys(event)
+        for key in keys:
+            project_key = self._projects.get(key)
+            if project_key is not None:
+                if fetch:
+                    self.hits += 1
+                return project_key
+
+        if not fetch or not keys:
+            return None
+        self.misses += 1
+        # A deleted child may have no parent anymore, its former parent still has one
+        project_key = None
+        for key in keys:
+            try:
+                project_keys = event.parent.item(key).traverse(meshql=PROJECT_QUERY)
+            except Exception as e:
+                log.debug(f"Failed to resolve the project of item #{key}: {e}")
+                continue
+            if project_keys:
+                project_key = project_keys[0]
+                break
+
+        if project_key is None:
+            # The parent is the project itself
+            parent = event.parent.item(keys[-1]).get()
+            if parent.type != "Project":
+                return None
+            project_key = parent._key
+
+        with self._lock:
+            for key in keys:
+                self._cache(key, project_key)
+        return project_key
+
+    def _cache(self, item_key: str, project_key: str):
+        self._projects[item_key] = project_key
+        self._projects.move_to_end(item_key)
+        while len(self._projects) > self.cache_size:
+            self._projects.popitem(last=False)
+
+    def accept(self, event) -> bool:
+        """Check if an event belongs to a paired project."""
+        paired = self.get_paired()
+        if paired is None:
+            self.kept += 1
+            return True
+
+        try:
+            project_key = self.get_project_key(event)
+        except Exception as e:
+            log.warning(f"Failed to resolve the project of event #{event._key}: {e}")
+            self.kept += 1
+            return True
+
+        if project_key not in paired:
+            # The project may be paired since the last refresh
+            paired = self.get_paired(max_age=self.unknown_ttl) or paired
+        if project_key in paired:
+            self.kept += 1
+            return True
+
+        self.dropped += 1
+        log.debug(f"Drop event {event.topic} #{event._key}, project {project_key} is not paired")
+        return False
@@ -0,0 +1,78 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from typing import Iterable, List, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class Spool:
+    """
+    Append-only on-disk queue of the Aquarium events to store on AYON.
+
+    Events are written to a SQLite database in WAL mode as soon as they are read
+    from the stream, and removed once AYON acknowledged them. Events still in the
+    spool when the leecher starts are sent again (at-least-once delivery, AYON
+    skips the events already stored by their hash).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Durable on process crash, an OS crash may lose the last transactions
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_key ON events (key)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def append(self, event) -> int:
+        """Write an event, return its spool id."""
+        payload = json.dumps(event.to_dict(), default=str)
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO events (key, payload) VALUES (?, ?)",
+                (event._key, payload),
+            )
+            return cursor.lastrowid
+
+    def read(self, after: int = 0, limit: int = 500) -> List[Tuple[int, dict]]:
+        """Read the events spooled after an id, in order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, payload FROM events WHERE id > ? ORDER BY id LIMIT ?",
+                (after, limit),
+            ).fetchall()
+        return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def ack(self, keys: Iterable[str]):
+        """Remove the events stored on AYON."""
+        keys = [(key,) for key in keys]
+        if not keys:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM events WHERE key = ?", keys)
+            self._db.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,59 @@
+""" Coalescing of the enrolled backlog, when the processor is catching up """
+from typing import List, Optional, Tuple
+
+from aquarium_common import expand_payload
+
+# Topics of the events whose handlers sync the current state of their item
+COALESCED_CATEGORIES = {"item", "user"}
+COALESCED_VERBS = {"created", "updated", "assigned", "unassigned"}
+
+
+def get_coalesce_key(rawEvent: dict) -> Optional[tuple]:
+    """Item and topic family of a leeched event, None if it can't be coalesced."""
+    if rawEvent.get("topic") != "aquarium.leech":
+        return None
+
+    payload = expand_payload(rawEvent.get("payload") or {})
+    parts = (payload.get("topic") or "").split(".")
+    if len(parts) < 2 or parts[0] not in COALESCED_CATEGORIES or parts[1] not in COALESCED_VERBS:
+        return None
+
+    # item.created.Shot and item.updated.Shot are the same family: item.Shot
+    family = ".".join([parts[0]] + parts[2:])
+    item = (payload.get("data") or {}).get("item") or {}
+    if not payload.get("emittedFrom") and not item.get("_key"):
+        return None
+    return (payload.get("emittedFrom"), item.get("_key"), family)
+
+
+def coalesce(items: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Keep only the newest event per item and topic family of a window of (event, job).
+
+    Handlers re-read their item from Aquarium, so the newest event of an item does
+    the work of the older ones. It takes the place of the oldest one, so an item is
+    still synced before the items created after it (its children). Events which
+    can't be coalesced are barriers, newer events are never moved before them.
+
+    Returns the kept (event, job) in order, and the superseded (job, newer job).
+    """
+    kept = []
+    superseded = []
+    slots = {}
+    for rawEvent, job in items:
+        key = get_coalesce_key(rawEvent)
+        if key is None:
+            # Other events (pairing, hierarchy changes...) can change how the next ones are handled
+            slots.clear()
+            kept.append((rawEvent, job))
+            continue
+
+        if key not in slots:
+            slots[key] = len(kept)
+            kept.append((rawEvent, job))
+            continue
+
+        index = slots[key]
+        superseded.append((kept[index][1], job))
+        kept[index] = (rawEvent, job)
+    return kept, superseded
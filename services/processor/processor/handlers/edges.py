@@ -0,0 +1,19 @@
+from .registry import handler
+from ..hierarchy import get_child_key
+
+import logging
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..processor import AquariumProcessor
+
+log = logging.getLogger(__name__)
+
+@handler("edge.*.Child")
+def child_changed(processor: "AquariumProcessor", event):
+    """An item is added, removed or moved in the hierarchy, its cached path is outdated."""
+    child_key = get_child_key(event)
+    if child_key:
+        processor.hierarchy.invalidate(child_key)
+    else:
+        log.warning(f"Child edge event #{event._key} without child, clear the hierarchy cache")
+        processor.hierarchy.clear()
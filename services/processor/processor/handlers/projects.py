@@ -7,13 +7,17 @@ from uuid import uuid4
 from copy import deepcopy
 from functools import reduce
 
-from .utils import ayonise_folder, ayonise_task
+from .utils import ayonise_folder, ayonise_task, iter_traverse
+from .registry import handler
 
 if TYPE_CHECKING:
     from ..processor import AquariumProcessor
 
 log = logging.getLogger(__name__)
 
+SYNC_PAGE_SIZE = 1000
+
+@handler("item.updated.Project")
 def updated(processor: "AquariumProcessor", event):
     if event.data.item is None:
         return
@@ -24,8 +28,10 @@ def updated(processor: "AquariumProcessor", event):
     if not project_name:
         return  # do nothing as aquarium and ayon project are not paired
 
+    # The project has just changed, skip the anatomy cached by the server
     attributes = ayon_api.get(
-        f"{processor.entrypoint}/projects/{project_name}/anatomy/attributes"
+        f"{processor.entrypoint}/projects/{project_name}/anatomy/attributes",
+        refresh=True,
     )
 
     payload = {
@@ -43,12 +49,14 @@ def sync(processor: "AquariumProcessor", aquariumProjectKey: str, eventId: str):
     if not project_name:
         return  # do nothing as aquarium and ayon project are not paired
 
-    query = "# -($Child, 3)> 0,1000 item.type IN ['Episode', 'Sequence', 'Shot', 'Library', 'Asset'] SET $set COLLECT type = item.type INTO items = $items SORT null VIEW $view"
+    # Sorted by key so pages are stable, items are grouped by type here
+    query = "# -($Child, 3)> {offset},{limit} item.type IN ['Episode', 'Sequence', 'Shot', 'Library', 'Asset'] SET $set SORT item._key VIEW $view"
     aliases = {
         "set": {
             "mainPath": "path.vertices",
         },
-        "items": {
+        "view": {
+            "type": "item.type",
             "folder": "item",
             "tasks": "# -($Child)> $Task SORT null VIEW $taskView",
             "path": "REVERSE(mainPath)" # REVERSE the path to match event path order
@@ -58,31 +66,27 @@ def sync(processor: "AquariumProcessor", aquariumProjectKey: str, eventId: str):
             "assignees": "# -($Assigned)> $User SORT null VIEW item.data.email",
             "path": "REVERSE(APPEND(mainPath, SHIFT(path.vertices)))" # REVERSE to match event path order and SHIFT to avoid item deduplication
         },
-        "view": {
-            "type": "type",
-            "items": "items"
-        }
     }
-    collections: list = processor._AQS.aq.project(aquariumProjectKey).traverse(meshql=query, aliases=aliases)
-    log.info(f"{len(collections)} items type found for project #{aquariumProjectKey}.")
+    rows = iter_traverse(processor._AQS.aq.project(aquariumProjectKey), query, aliases, page_size=SYNC_PAGE_SIZE)
 
     items = {}
     eventSummary = {}
     cast = processor._AQS.aq.cast
-    for itemType in collections:
-        log.debug(f"Processing {itemType['type']} items...")
-        items[itemType["type"]] = []
-        for item in itemType["items"]:
-            log.debug(f"  - Processing {item['folder']['data']['name']}...")
-            items[itemType["type"]].append({
+    for item in rows:
+        log.debug(f"Processing {item['type']} {item['folder']['data']['name']}...")
+        items.setdefault(item["type"], []).append({
                 "folder": ayonise_folder(cast(item['folder'])),
-                "tasks": [dict(task=ayonise_task(cast(task["task"]), task['assignees']), path=task["path"]) for task in item['tasks']],
+                "tasks": [dict(task=ayonise_task(cast(task["task"]), task['assignees'], processor.users), path=task["path"]) for task in item['tasks']],
                 "path": item['path']
             })
-
-            # items[itemType["type"]] = [{folder, tasks: []}]
-        eventSummary[itemType["type"]] = {
-            "count": reduce(lambda count, item: count + 1 + len(item["tasks"]), items[itemType["type"]], 0),
+    # Parents are synced before their children of the same type
+    for typeItems in items.values():
+        typeItems.sort(key=lambda item: len(item["path"]))
+
+    log.info(f"{len(items)} items type found for project #{aquariumProjectKey}.")
+    for itemType, typeItems in items.items():
+        eventSummary[itemType] = {
+            "count": reduce(lambda count, item: count + 1 + len(item["tasks"]), typeItems, 0),
             "error": None,
             "progression": 0
         }
@@ -181,6 +185,7 @@ def create(processor: "AquariumProcessor", aquariumProjectName: str, ayonProject
                 "aquariumProjectKey": imported['items'][0]['_key'],
             }
         )
+        processor.pairing.set(imported['items'][0]['_key'], ayonProjectName)
 
     log.info(f"Project {ayonProjectName} created on Aquarium.")
 
@@ -0,0 +1,127 @@
+""" Registry of the handlers of Aquarium events topics """
+import time
+import logging
+import threading
+from bisect import bisect_right
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the handlers timing histogram buckets, the last bucket is unbounded
+TIMING_BUCKETS = (10, 50, 100, 250, 500, 1000, 5000)
+
+
+class Handler:
+    """
+    A handler of the Aquarium events matching a topic pattern.
+
+    `pattern` is a glob pattern, like `item.*.Shot`. With a `concurrency` over 0,
+    at most `concurrency` events are handled at the same time by the workers.
+    """
+
+    def __init__(self, func: Callable, pattern: str, concurrency: int = 0):
+        self.func = func
+        self.pattern = pattern
+        self.name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        self.concurrency = concurrency
+        self._semaphore = threading.BoundedSemaphore(concurrency) if concurrency > 0 else None
+
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(TIMING_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def matches(self, topic: str) -> bool:
+        return fnmatchcase(topic, self.pattern)
+
+    def __call__(self, processor, event) -> Any:
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        started = time.perf_counter()
+        failed = False
+        try:
+            return self.func(processor, event)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if self._semaphore is not None:
+                self._semaphore.release()
+            self._record(elapsed, failed)
+
+    def _record(self, elapsed: float, failed: bool):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.total += elapsed
+            self.max = max(self.max, elapsed)
+            self.histogram[bisect_right(TIMING_BUCKETS, elapsed)] += 1
+
+    def stats(self) -> dict:
+        buckets = [f"<{bound}ms" for bound in TIMING_BUCKETS] + [f">={TIMING_BUCKETS[-1]}ms"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg": round(self.total / self.calls, 1) if self.calls else None,
+            "max": round(self.max, 1),
+            "histogram": {
+                bucket: count
+                for bucket, count in zip(buckets, self.histogram)
+                if count
+            },
+        }
+
+
+class HandlerRegistry:
+    """
+    Map Aquarium events topics to their handlers.
+
+    Handlers are registered with the `handler` decorator in the handlers modules.
+    Handlers of a topic are resolved once and cached, in their registration order.
+    """
+
+    def __init__(self):
+        self.handlers: List[Handler] = []
+        self._topics: Dict[str, List[Handler]] = {}
+        self._lock = threading.Lock()
+
+    def handler(self, pattern: str, concurrency: int = 0):
+        """Register the decorated function as handler of the events matching `pattern`."""
+        def decorator(func: Callable) -> Callable:
+            self.register(func, pattern, concurrency)
+            return func
+        return decorator
+
+    def register(self, func: Callable, pattern: str, concurrency: int = 0) -> Handler:
+        handler = Handler(func, pattern, concurrency)
+        with self._lock:
+            self.handlers.append(handler)
+            self._topics = {}
+        return handler
+
+    def match(self, topic: Optional[str]) -> List[Handler]:
+        """Handlers of a topic, empty if the topic is not handled."""
+        if not topic:
+            return []
+
+        handlers = self._topics.get(topic)
+        if handlers is None:
+            handlers = [handler for handler in self.handlers if handler.matches(topic)]
+            with self._lock:
+                self._topics[topic] = handlers
+        return handlers
+
+    def stats(self) -> dict:
+        return {
+            f"{handler.pattern} {handler.name}": handler.stats()
+            for handler in self.handlers
+            if handler.calls
+        }
+
+
+registry = HandlerRegistry()
+handler = registry.handler
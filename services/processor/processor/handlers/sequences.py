@@ -1,12 +1,15 @@
 from .utils import sync_folder
+from .registry import handler
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..processor import AquariumProcessor
 
+@handler("item.created.Sequence")
 def created(processor: "AquariumProcessor", event):
     sync_folder(processor, event)
 
+@handler("item.updated.Sequence")
 def updated(processor: "AquariumProcessor", event):
     sync_folder(processor, event)
 
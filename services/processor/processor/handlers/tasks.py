@@ -1,4 +1,5 @@
 from .utils import ayonise_task
+from .registry import handler
 
 import ayon_api
 import logging
@@ -8,18 +9,22 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+@handler("item.created.Task")
 def created(processor: "AquariumProcessor", event):
     sync_task(processor, event)
 
+@handler("item.updated.Task")
 def updated(processor: "AquariumProcessor", event):
     sync_task(processor, event)
 
+@handler("user.assigned")
+@handler("user.unassigned")
 def assigned(processor: "AquariumProcessor", event):
     sync_task(processor, event)
 
 def sync_task(processor: "AquariumProcessor", event):
     """Send sync request to Aquarium addon API."""
-    context = event.get_context()
+    context = processor.hierarchy.get_context(event)
     aqTask = context["path"][0]
     aqProject = context["project"]
 
@@ -27,8 +32,9 @@ def sync_task(processor: "AquariumProcessor", event):
     if not project_name:
         return  # do nothing as aquarium and ayon project are not paired
 
-    aqUserEmails = aqTask.traverse(meshql="# -($Assigned)> $User VIEW item.data.email")
-    task = ayonise_task(aqTask, aqUserEmails)
+    # Assignment events change the assignees, they are read from Aquarium
+    aqUserEmails = get_assignee_emails(processor, aqTask, refresh=event.topic.startswith("user."))
+    task = ayonise_task(aqTask, aqUserEmails, processor.users)
 
     response = ayon_api.post(
         f"{processor.entrypoint}/projects/{project_name}/sync/task",
@@ -40,3 +46,15 @@ def sync_task(processor: "AquariumProcessor", event):
         response.raise_for_status()
     except Exception as e:
         log.error(f"Error while syncing {aqTask.type} {aqTask._key}: {e}")
+
+def get_assignee_emails(processor: "AquariumProcessor", aqTask, refresh: bool = False):
+    """Emails of the users assigned to a task, from the local mirror when enabled."""
+    if processor.mirror is not None and not refresh:
+        aqUserEmails = processor.mirror.get_assignees(aqTask._key)
+        if aqUserEmails is not None:
+            return aqUserEmails
+
+    aqUserEmails = aqTask.traverse(meshql="# -($Assigned)> $User VIEW item.data.email")
+    if processor.mirror is not None:
+        processor.mirror.set_assignees(aqTask._key, aqUserEmails)
+    return aqUserEmails
@@ -8,9 +8,9 @@ import ayon_api
 
 if TYPE_CHECKING:
     from ..processor import AquariumProcessor
+    from ..users import UserDirectory
 
 log = logging.getLogger(__name__)
-ayonUsers = None  # Declare ayonUsers as a global variable
 
 def unaccent(input_str: str) -> str:
     """Remove accents from a string"""
@@ -18,16 +18,21 @@ def unaccent(input_str: str) -> str:
     return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
 
 
-def get_ayon_users():
-    """Create a map of Ayon users name by their email address."""
-    global ayonUsers  # Use the global variable ayonUsers
+def iter_traverse(aqItem, meshql: str, aliases: dict, page_size: int = 1000):
+    """Traverse from an Aquarium item page by page and yield results lazily.
 
-    if ayonUsers is None:
-        ayonUsers = {
-            user["attrib"]["email"]: user["name"] for user in ayon_api.get_users()
-        }
-
-    return ayonUsers
+    The meshql must contain an `{offset},{limit}` window, filled for each page, and a
+    stable SORT so items are not skipped or duplicated between two pages. A page shorter
+    than `page_size` is the last one, so each row must be a traversed item (no COLLECT).
+    """
+    offset = 0
+    while True:
+        query = meshql.replace("{offset}", str(offset)).replace("{limit}", str(page_size))
+        page = aqItem.traverse(meshql=query, aliases=aliases)
+        yield from page
+        if len(page) < page_size:
+            return
+        offset += page_size
 
 def ayonise_folder(aqItem) -> dict[str, str]:
     """Convert an Aquarium item to an Ayon folder entity structure."""
@@ -58,7 +63,7 @@ def ayonise_folder(aqItem) -> dict[str, str]:
 def sync_folder(processor: "AquariumProcessor", event):
     """Send sync request to Aquarium addon API."""
 
-    context = event.get_context()
+    context = processor.hierarchy.get_context(event)
     aqItem = context["path"][0]
     aqProject = context["project"]
 
@@ -78,7 +83,7 @@ def sync_folder(processor: "AquariumProcessor", event):
     except Exception as e:
         log.error(f"Error while syncing {aqItem.type} {aqItem._key}: {e}")
 
-def ayonise_task(aqTask, aqUserEmails) -> dict[str, str]:
+def ayonise_task(aqTask, aqUserEmails, users: "UserDirectory") -> dict[str, str]:
     """Convert an Aquarium task to an Ayon task entity structure."""
 
     ayonised = {
@@ -103,9 +108,9 @@ def ayonise_task(aqTask, aqUserEmails) -> dict[str, str]:
     if 'description' in aqTask.data:
         ayonised['attrib']['description'] = aqTask.data.description
 
-    ayon_users = get_ayon_users()
     for aqUserEmail in aqUserEmails:
-        if aqUserEmail in ayon_users:
-            ayonised['assignees'].append(ayon_users[aqUserEmail])
+        ayonUserName = users.get_name(aqUserEmail)
+        if ayonUserName:
+            ayonised['assignees'].append(ayonUserName)
 
     return ayonised
\ No newline at end of file
@@ -0,0 +1,172 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+log = logging.getLogger(__name__)
+
+
+def get_event_item_key(event) -> Optional[str]:
+    """Key of the item `Event.get_context()` starts from, None if it can't be known before."""
+    if event.emittedFrom:
+        return event.emittedFrom.split("/")[-1]
+
+    item = event.data.get("item") if event.data else None
+    if event.topic.startswith("item.") and item:
+        return item.get("_key")
+    return None
+
+
+def get_child_key(event) -> Optional[str]:
+    """Key of the child item of a `Child` edge event."""
+    for value in (event.data or {}).values():
+        child_id = value.get("_to") if isinstance(value, dict) else getattr(value, "_to", None)
+        if isinstance(child_id, str) and child_id:
+            return child_id.split("/")[-1]
+    return None
+
+
+class HierarchyCache:
+    """
+    Ancestors of Aquarium items, to resolve the context of events without traversing Aquarium.
+
+    The path of each item resolved with `Event.get_context()` is cached, for the item and
+    all its ancestors. On a hit, only the item itself is read from Aquarium, ancestors
+    come from the cache and are refreshed each time they are read themselves.
+
+    `Child` edge events (created, deleted, moves) invalidate the child item and its
+    cached descendants, their path is resolved again on their next event. Paths loaded
+    in background (see `begin`) skip the items invalidated since their load started.
+    """
+
+    def __init__(self, aq, maxsize: int = 100000):
+        self.aq = aq
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        # item key -> ancestor keys, up to the project
+        self._paths: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._items: Dict[str, object] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Version of the invalidations made while paths are loaded in background
+        self._version = 0
+        self._loading = 0
+        self._invalidated: Dict[str, int] = {}
+        self._cleared = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached": len(self._paths),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+
+    def get_context(self, event) -> dict:
+        """Same as `Event.get_context()`, from the cache when the item path is known."""
+        item_key = get_event_item_key(event)
+        with self._lock:
+            ancestors = self._paths.get(item_key) if item_key else None
+            if ancestors is not None:
+                self._paths.move_to_end(item_key)
+                ancestor_items = [self._items.get(key) for key in ancestors]
+
+        if ancestors is not None and None not in ancestor_items:
+            item = self.aq.item(item_key).get()
+            with self._lock:
+                self.hits += 1
+                self._items[item_key] = item
+            return {"project": ancestor_items[-1], "path": [item] + ancestor_items}
+
+        with self._lock:
+            self.misses += 1
+        context = event.get_context()
+        self.store(context["path"])
+        return context
+
+    def get_project_key(self, item_key: str) -> Optional[str]:
+        """Project of a cached item, None if its path is not cached."""
+        ancestors = self._paths.get(item_key)
+        return ancestors[-1] if ancestors else None
+
+    def get_type(self, item_key: str) -> Optional[str]:
+        item = self._items.get(item_key)
+        return item.type if item is not None else None
+
+    def begin(self) -> int:
+        """Start loading paths in background, return the version to `store` them with."""
+        with self._lock:
+            self._loading += 1
+            return self._version
+
+    def end(self):
+        with self._lock:
+            self._loading -= 1
+            if not self._loading:
+                self._invalidated.clear()
+
+    def store(self, path: list, since: Optional[int] = None):
+        """
+        Cache the ancestors of each item of a path, ordered from the item to its project.
+        With the `since` version of `begin`, items invalidated since then and their
+        descendants in the path are not cached.
+        """
+        with self._lock:
+            start = 0
+            if since is not None:
+                if self._cleared > since:
+                    return
+                for index, item in enumerate(path):
+                    if self._invalidated.get(item._key, 0) > since:
+                        start = index + 1
+
+            for index, item in enumerate(path[start:], start):
+                self._items[item._key] = item
+                if index == len(path) - 1:
+                    break
+
+                self._paths[item._key] = [ancestor._key for ancestor in path[index + 1:]]
+                self._paths.move_to_end(item._key)
+                self._children.setdefault(path[index + 1]._key, set()).add(item._key)
+
+            while len(self._paths) > self.maxsize:
+                key, ancestors = self._paths.popitem(last=False)
+                self._forget(key, ancestors)
+
+    def invalidate(self, item_key: str):
+        """Forget the path of an item and of its descendants."""
+        with self._lock:
+            self._version += 1
+            if self._loading:
+                self._invalidated[item_key] = self._version
+            stack = [item_key]
+            while stack:
+                key = stack.pop()
+                ancestors = self._paths.pop(key, None)
+                if ancestors is not None:
+                    self.invalidations += 1
+                    self._forget(key, ancestors)
+                stack.extend(self._children.pop(key, ()))
+
+    def _forget(self, key: str, ancestors: List[str]):
+        # Children of the item keep their entry, they are forgotten with their own path
+        self._items.pop(key, None)
+        siblings = self._children.get(ancestors[0]) if ancestors else None
+        if siblings is not None:
+            siblings.discard(key)
+            if not siblings:
+                del self._children[ancestors[0]]
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._cleared = self._version
+            self._paths.clear()
+            self._items.clear()
+            self._children.clear()
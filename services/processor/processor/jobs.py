@@ -0,0 +1,104 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from ayon_api import post
+
+log = logging.getLogger(__name__)
+
+
+class JobStatuses:
+    """
+    Write the status transitions of processor jobs in batches.
+
+    Transitions are queued and sent to the addon `/events/jobs` endpoint every
+    `flush_interval` seconds. A job with several transitions queued only sends its
+    latest one, so a job processed within the interval goes straight to `finished`.
+    Transitions which failed to be sent are kept for the next flush.
+    """
+
+    def __init__(self, entrypoint: str, sender: str, flush_interval: float = 0.5):
+        self.entrypoint = entrypoint
+        self.sender = sender
+        self.flush_interval = flush_interval
+
+        self.sent = 0
+        self.requests = 0
+        self.collapsed = 0
+        self.errors = 0
+
+        # job id -> (status, description), in the order they were set
+        self._pending: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent,
+            "requests": self.requests,
+            "collapsed": self.collapsed,
+            "errors": self.errors,
+        }
+
+    def start(self) -> "JobStatuses":
+        self._running = True
+        self._thread = threading.Thread(target=self._work, name="aquarium-job-statuses", daemon=True)
+        self._thread.start()
+        return self
+
+    def set(self, job_id: str, status: str, description: str = None, urgent: bool = False):
+        """Queue a job status, sent on next flush or right away when `urgent`."""
+        with self._lock:
+            if job_id in self._pending:
+                self.collapsed += 1
+                del self._pending[job_id]
+            self._pending[job_id] = (status, description)
+            if urgent:
+                self._lock.notify()
+
+    def flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = OrderedDict()
+        if not pending:
+            return
+
+        jobs = [
+            {"id": job_id, "status": status, "description": description}
+            for job_id, (status, description) in pending.items()
+        ]
+        try:
+            response = post(f"{self.entrypoint}/events/jobs", sender=self.sender, jobs=jobs)
+            response.raise_for_status()
+        except Exception as e:
+            self.errors += 1
+            log.warning(f"Failed to update {len(jobs)} jobs status, retry on next flush: {e}")
+            with self._lock:
+                # Newer transitions set meanwhile are kept
+                for job_id, transition in pending.items():
+                    self._pending.setdefault(job_id, transition)
+            return
+
+        self.requests += 1
+        self.sent += len(jobs)
+        for job_id in response.data.get("missing", []):
+            log.warning(f"Job {job_id} not found, its status is lost")
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._lock.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if self._running:
+                    self._lock.wait(self.flush_interval)
+                if not self._running:
+                    return
+            self.flush()
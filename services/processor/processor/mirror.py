@@ -0,0 +1,119 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from .handlers.utils import iter_traverse
+from .hierarchy import HierarchyCache
+
+log = logging.getLogger(__name__)
+
+SEED_PAGE_SIZE = 1000
+SEED_QUERY = "# -($Child, 10)> {offset},{limit} item.type != 'User' SORT item._key VIEW $view"
+SEED_ALIASES = {
+    "view": {
+        "item": "item",
+        "parent": "path.vertices[-2]._key",
+        "assignees": "# -($Assigned)> $User VIEW item.data.email",
+    }
+}
+
+
+class ProjectMirror:
+    """
+    Local mirror of the graph of the paired Aquarium projects.
+
+    Each project is seeded with a paged traverse of its `Child` hierarchy: the path of
+    every item is stored in the hierarchy cache, and the assignees of every task are
+    kept here. Afterwards the mirror is kept current by the handlers, from `Child` edge
+    events (hierarchy cache invalidation) and `user.assigned`/`user.unassigned` events.
+    Events are processed while a project is seeded, the seed doesn't overwrite the paths
+    and assignees they changed meanwhile.
+
+    Paths, project and type of items are answered by the hierarchy cache.
+    """
+
+    def __init__(self, aq, hierarchy: HierarchyCache):
+        self.aq = aq
+        self.hierarchy = hierarchy
+
+        self.seeded = set()
+        self.hits = 0
+        self.misses = 0
+
+        self._assignees: Dict[str, List[str]] = {}
+        # Version of the last assignees change of each task
+        self._version = 0
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self.seeded),
+            "tasks": len(self._assignees),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def seed(self, project_key: str):
+        """Load the hierarchy and the task assignees of a project."""
+        log.info(f"Seeding the mirror of project #{project_key}...")
+        with self._lock:
+            started = self._version
+        hierarchy_version = self.hierarchy.begin()
+        try:
+            count = self._seed(project_key, started, hierarchy_version)
+        finally:
+            self.hierarchy.end()
+        log.info(f"Mirror of project #{project_key} seeded with {count} items")
+
+    def _seed(self, project_key: str, started: int, hierarchy_version: int) -> int:
+        project = self.aq.project(project_key).get()
+        items = {project_key: project}
+        parents = {}
+        assignees = {}
+        for row in iter_traverse(project, SEED_QUERY, SEED_ALIASES, page_size=SEED_PAGE_SIZE):
+            item = self.aq.cast(row["item"])
+            if item._key in items:
+                continue  # An item with several parents keeps the first one
+            items[item._key] = item
+            parents[item._key] = row["parent"]
+            if item.type == "Task":
+                assignees[item._key] = row["assignees"] or []
+
+        for key in parents:
+            path = [items[key]]
+            parent_key = parents.get(key)
+            while parent_key is not None and parent_key in items:
+                path.append(items[parent_key])
+                parent_key = parents.get(parent_key)
+            if path[-1]._key == project_key:
+                self.hierarchy.store(path, since=hierarchy_version)
+
+        with self._lock:
+            for task_key, emails in assignees.items():
+                if self._versions.get(task_key, 0) <= started:
+                    self._assignees[task_key] = emails
+            self.seeded.add(project_key)
+        return len(items)
+
+    def seed_all(self, project_keys):
+        for project_key in project_keys:
+            try:
+                self.seed(project_key)
+            except Exception:
+                log.exception(f"Failed to seed the mirror of project #{project_key}")
+
+    def get_assignees(self, task_key: str) -> Optional[List[str]]:
+        """Emails of the users assigned to a task, None if the task is not mirrored."""
+        emails = self._assignees.get(task_key)
+        if emails is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return emails
+
+    def set_assignees(self, task_key: str, emails: List[str]):
+        with self._lock:
+            self._version += 1
+            self._versions[task_key] = self._version
+            self._assignees[task_key] = list(emails)
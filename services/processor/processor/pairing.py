@@ -0,0 +1,107 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+from ayon_api import get
+
+log = logging.getLogger(__name__)
+
+
+class PairingCache:
+    """
+    Aquarium project key -> AYON project name of the paired projects.
+
+    The pairing is read from the addon `/projects/pair?paired=true` endpoint and
+    refreshed every `ttl` seconds. Unknown projects are cached as unpaired for
+    `negative_ttl` seconds, and refresh the pairing at most once per `negative_ttl`
+    seconds, so the events of unpaired projects don't refresh it each time.
+    Pairing changes are applied right away from the `aquarium.pairing` events
+    dispatched by the addon.
+    """
+
+    def __init__(self, entrypoint: str, ttl: float = 300, negative_ttl: float = 60):
+        self.entrypoint = entrypoint
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.refreshes = 0
+
+        self._pairs: Dict[str, str] = {}
+        # Aquarium project key -> time until it's known as unpaired
+        self._unpaired: Dict[str, float] = {}
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            "paired": len(self._pairs),
+            "unpaired": len(self._unpaired),
+            "hits": self.hits,
+            "negativeHits": self.negative_hits,
+            "refreshes": self.refreshes,
+        }
+
+    @property
+    def paired_keys(self) -> list:
+        return list(self._pairs)
+
+    def refresh(self):
+        response = get(f"{self.entrypoint}/projects/pair", paired=True)
+        response.raise_for_status()
+        pairs = {
+            pair["aquariumProjectKey"]: pair["ayonProjectName"]
+            for pair in response.data
+            if pair.get("aquariumProjectKey") and pair.get("ayonProjectName")
+        }
+        with self._lock:
+            self._pairs = pairs
+            self._unpaired = {}
+            self._refreshed_at = time.time()
+            self.refreshes += 1
+
+    def get(self, aq_project_key: str) -> Optional[str]:
+        """AYON project name paired with an Aquarium project, None if not paired."""
+        now = time.time()
+        if now - self._refreshed_at > self.ttl:
+            self.refresh()
+
+        project_name = self._pairs.get(aq_project_key)
+        if project_name is not None:
+            self.hits += 1
+            return project_name
+
+        unpaired_until = self._unpaired.get(aq_project_key)
+        if unpaired_until is not None and unpaired_until > now:
+            self.negative_hits += 1
+            return None
+
+        # Missed pairing events are caught by refreshing, at most once per `negative_ttl`
+        if now - self._refreshed_at > self.negative_ttl:
+            self.refresh()
+            project_name = self._pairs.get(aq_project_key)
+        if project_name is None:
+            with self._lock:
+                self._unpaired[aq_project_key] = time.time() + self.negative_ttl
+        return project_name
+
+    def set(self, aq_project_key: str, ayon_project_name: Optional[str]):
+        """Pair a project, or unpair it when `ayon_project_name` is None."""
+        with self._lock:
+            if ayon_project_name:
+                self._pairs[aq_project_key] = ayon_project_name
+                self._unpaired.pop(aq_project_key, None)
+            else:
+                self._pairs.pop(aq_project_key, None)
+                self._unpaired[aq_project_key] = time.time() + self.negative_ttl
+
+    def apply(self, payload: dict):
+        """Apply an `aquarium.pairing` event payload."""
+        aq_project_key = payload.get("aquariumProjectKey")
+        if not aq_project_key:
+            return
+
+        log.info(f"Aquarium project {aq_project_key} {'paired' if payload.get('paired') else 'unpaired'}")
+        self.set(aq_project_key, payload.get("ayonProjectName") if payload.get("paired") else None)
@@ -1,17 +1,20 @@
 import time
 import queue
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 from ayon_api import (
-    get,
     get_service_addon_name,
     get_service_addon_version,
+    get_service_addon_settings,
     enroll_event_job,
     get_event,
-    update_event,
 )
 
-from aquarium_common import AquariumServices, connect_to_ayon, register_signals
+from aquarium_common import AquariumServices, EventDispatcher, connect_to_ayon, expand_payload, register_signals
+# Handlers modules are imported to register their handlers
 from .handlers import (
     sequences,
     projects,
@@ -19,10 +22,36 @@ from .handlers import (
     assets,
     shots,
     tasks,
+    edges,
 )
+from .handlers.registry import registry
+from .jobs import JobStatuses
+from .backlog import coalesce
+from .pairing import PairingCache
+from .users import UserDirectory
+from .hierarchy import HierarchyCache
+from .mirror import ProjectMirror
 
 log = logging.getLogger(__name__)
 _AQS = AquariumServices()
+STATS_INTERVAL = 60
+# Maximum number of jobs enrolled per prefetch cycle, their source events are fetched concurrently
+PREFETCH_BATCH = 10
+# Source topics of the processed jobs and their description, by priority
+ENROLL_TOPICS = (
+    ("aquarium.sync_project", "Processing sync project"),
+    ("aquarium.project_create", "Processing create Aquarium project"),
+    ("aquarium.pairing", "Processing project pairing"),
+    ("aquarium.leech", "Event processing"),
+)
+
+
+def get_job_key(item) -> str:
+    """Project of a job, jobs of the same project are processed in order by the same worker."""
+    rawEvent, job = item
+    payload = rawEvent.get("payload") or {}
+    # Leeched events without a resolved project all go to the same worker
+    return payload.get("aquariumProjectKey") or rawEvent.get("project") or ""
 
 # Aquarium processor class
 class AquariumProcessor():
@@ -30,11 +59,14 @@ class AquariumProcessor():
         Aquarium processor is responsible for processing events from the leecher
         with the appropriate handler. The processor is also responsible for transforming
         Aquarium structure to Ayon structure. The "Ayonisation" is done in the handlers.
+        Jobs are processed by a pool of workers, the jobs of a same project by the same
+        worker so they are processed in the order they were enrolled.
+        Jobs are enrolled ahead of the workers into a bounded prefetch buffer, and their
+        status transitions are written to AYON in batches.
     """
 
-    _events_queue = queue.Queue()
+    _events_queue: queue.Queue
 
-    pairing_list = []
     handlers = []
     processing = False
 
@@ -50,74 +82,199 @@ class AquariumProcessor():
         self._AQS = parent
         self.processing = False
 
-        self.pairing_list = self.get_pairing_list()
-
-    def get_next_aquarium_event(self):
-        """Full project sync is prioritized over other events."""
-
-        return enroll_event_job(
-            source_topic="aquarium.sync_project",
-            target_topic="aquarium.process",
-            sender=get_service_addon_name(),
-            description="Processing sync project",
-            sequential=True
-        ) or enroll_event_job(
-            source_topic="aquarium.project_create",
-            target_topic="aquarium.process",
-            sender=get_service_addon_name(),
-            description="Processing create Aquarium project",
-            sequential=True
-        ) or enroll_event_job(
-            source_topic="aquarium.leech",
-            target_topic="aquarium.process",
-            sender=get_service_addon_name(),
-            description="Event processing",
-            sequential=True
+        self.pairing = PairingCache(self.entrypoint)
+        self.pairing.refresh()
+        # Shared by the workers to map Aquarium assignees to AYON users
+        self.users = UserDirectory(parent.aq)
+
+        settings = get_service_addon_settings()["services"].get("processor", {})
+        self.hierarchy = HierarchyCache(parent.aq)
+        self.mirror = None
+        if settings.get("mirror", False):
+            self.mirror = ProjectMirror(parent.aq, self.hierarchy)
+        self.workers = settings.get("workers", 4)
+        self.coalesce_window = settings.get("coalesce_window", 100)
+        self.catching_up = False
+        self.superseded = 0
+        self._events_queue = queue.Queue(maxsize=settings.get("prefetch", 20))
+        self._fetcher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aquarium-fetch")
+        # Description of the source event of each enrolled job
+        self._descriptions = {}
+        self.statuses = JobStatuses(
+            self.entrypoint,
+            self.addon_name,
+            flush_interval=settings.get("status_interval_ms", 500) / 1000,
         )
+        self.dispatcher = EventDispatcher(
+            self.process_job,
+            workers=self.workers,
+            queue_size=settings.get("queue_size", 10),
+            key=get_job_key,
+        )
+        self._stats_at = time.time()
 
-    def load_event_from_jobs(self):
-        job = self.get_next_aquarium_event()
-        if not job:
-            return False
+    def get_next_aquarium_event(self, exhausted: Optional[set] = None):
+        """
+        Full project sync is prioritized over other events.
+        A sequential enrollment waits for every `aquarium.process` job to be finished, so
+        with several workers all jobs are enrolled in parallel and ordered per project by
+        the workers instead, a full sync is not held by the leeched backlog.
+        Source topics without job are added to `exhausted`, and skipped when given again.
+        """
+        for source_topic, description in ENROLL_TOPICS:
+            if exhausted is not None and source_topic in exhausted:
+                continue
 
-        event = get_event(job["dependsOn"])
-        self._events_queue.put((event, job))
-        return True
+            job = enroll_event_job(
+                source_topic=source_topic,
+                target_topic="aquarium.process",
+                sender=get_service_addon_name(),
+                description=description,
+                # A single worker processes all jobs in order
+                sequential=self.workers == 1,
+            )
+            if job:
+                return job
+            if exhausted is not None:
+                exhausted.add(source_topic)
+        return None
+
+    def enroll_events(self, count: int = 1) -> Tuple[List[tuple], int]:
+        """
+        Enroll up to `count` jobs and fetch their source events.
+        Returns the (event, job) to process, and the number of jobs enrolled.
+        """
+        jobs = []
+        # Topics without job are not enrolled again in this cycle
+        exhausted = set()
+        while len(jobs) < count:
+            job = self.get_next_aquarium_event(exhausted)
+            if not job:
+                break
+            jobs.append(job)
+
+        events = self._fetcher.map(lambda job: get_event(job["dependsOn"]), jobs)
+        items = [(event, job) for event, job in zip(events, jobs)]
+        if self.catching_up:
+            items, superseded = coalesce(items)
+            for job, newer_job in superseded:
+                self.set_job_superseded(job, newer_job)
+
+        for event, job in items:
+            self._descriptions[job["id"]] = event["description"]
+        return items, len(jobs)
+
+    def load_event_from_jobs(self, count: int = 1) -> int:
+        """Enroll up to `count` jobs into the prefetch buffer, return the number of jobs enrolled."""
+        items, enrolled = self.enroll_events(count)
+        for item in items:
+            # Blocks while the prefetch buffer is full
+            self._events_queue.put(item)
+        return enrolled
+
+    def get_enroll_count(self) -> int:
+        # Jobs enrolled sequentially are enrolled one at a time
+        if self.workers == 1:
+            return 1
+        return self.coalesce_window if self.catching_up else PREFETCH_BATCH
+
+    def update_catching_up(self, count: int, loaded: int):
+        # A full batch means there is a backlog, it's coalesced while catching up
+        catching_up = count > 1 and loaded == count and self.coalesce_window > 1
+        if catching_up != self.catching_up:
+            self.catching_up = catching_up
+            if catching_up:
+                log.info("Processor is behind, catching up by coalescing the backlog")
+            else:
+                log.info(f"Processor caught up, {self.superseded} superseded events so far")
+
+    def prefetch(self):
+        """Enroll jobs as long as there are some, ahead of the workers."""
+        while self.processing:
+            count = self.get_enroll_count()
+            try:
+                loaded = self.load_event_from_jobs(count)
+            except Exception:
+                log.exception("Failed to enroll a job")
+                loaded = 0
+
+            self.update_catching_up(count, loaded)
+            if not loaded:
+                time.sleep(0.1)
+
+    def seed_mirror(self, project_keys=None):
+        """Seed the mirror of projects, by default the paired ones, in background."""
+        if self.mirror is None:
+            return
+        # Events are processed meanwhile, resolving their context from Aquarium
+        threading.Thread(
+            target=self.mirror.seed_all,
+            args=(self.pairing.paired_keys if project_keys is None else project_keys,),
+            name="aquarium-mirror",
+            daemon=True,
+        ).start()
+
+    def log_stats(self, dispatch_stats: dict):
+        if time.time() - self._stats_at <= STATS_INTERVAL:
+            return
+
+        self._stats_at = time.time()
+        log.info(f"Dispatch stats: {dispatch_stats}")
+        log.info(f"Job status stats: {self.statuses.stats()}")
+        log.info(f"Handler stats: {registry.stats()}")
+        log.info(f"Pairing stats: {self.pairing.stats()}")
+        log.info(f"Users stats: {self.users.stats()}")
+        log.info(f"Hierarchy cache stats: {self.hierarchy.stats()}")
+        if self.mirror is not None:
+            log.info(f"Mirror stats: {self.mirror.stats()}")
+        if self.superseded:
+            log.info(f"Superseded events: {self.superseded}")
 
     def wait(self, duration=None):
         """Overridden wait
-        Event are loaded from Mongo DB when queue is empty. Handled event is
-        set as processed in Mongo DB.
+        Event are prefetched from Mongo DB by a background thread and sent to the workers.
+        Handled event is set as processed in Mongo DB.
         """
 
         self.processing = True
         started = time.time()
-        log.info("Processor listening loop started")
+        self.statuses.start()
+        self.seed_mirror()
+        self.dispatcher.start()
+        threading.Thread(target=self.prefetch, name="aquarium-prefetch", daemon=True).start()
+        log.info(f"Processor listening loop started with {self.workers} workers")
         while self.processing:
-            job = None
             try:
                 item = self._events_queue.get(timeout=0.5)
-                if isinstance(item, tuple):
-                    rawEvent, job = item
-                else:
-                    rawEvent = item
+                if not isinstance(item, tuple):
+                    item = (item, None)
 
             except queue.Empty:
-                if not self.load_event_from_jobs():
-                    time.sleep(0.1)
                 continue
 
-            self.set_job_processing(job)
-
-            self.process_event(rawEvent, job)
-
-            if job is not None:
-                self.set_job_finished(job)
+            # Blocks while the queue of the project worker is full
+            self.dispatcher.submit(item)
+            self.log_stats(self.dispatcher.stats())
 
             if duration is not None:
                 if (time.time() - started) > duration:
                     break
 
+    def process_job(self, item):
+        rawEvent, job = item
+        try:
+            if job is not None:
+                self.set_job_processing(job)
+            self.process_event(rawEvent, job)
+        except Exception:
+            log.exception(f"Failed to process event {rawEvent['topic']} {rawEvent.get('id')}")
+            if job is not None:
+                self.set_job_failed(job)
+            return
+
+        if job is not None:
+            self.set_job_finished(job)
+
     def process_event(self, rawEvent: dict, job):
         ayonTopic = rawEvent["topic"]
         log.info(f"Processing event: {ayonTopic}")
@@ -130,80 +287,62 @@ class AquariumProcessor():
         # TODO: Users are not synced yet. Need to be checked with users before.
         if ayonTopic == 'aquarium.sync_project':
             projects.sync(self, rawEvent["payload"]['aquariumProjectKey'], job.get('dependsOn', ''))
-        if ayonTopic == 'aquarium.project_create':
+        if ayonTopic == 'aquarium.pairing':
+            self.pairing.apply(rawEvent["payload"])
+            if rawEvent["payload"].get("paired"):
+                self.seed_mirror([rawEvent["payload"]["aquariumProjectKey"]])
+        elif ayonTopic == 'aquarium.project_create':
             projects.create(self, rawEvent["payload"]['aquariumProjectName'], rawEvent["project"])
         elif ayonTopic == 'aquarium.leech':
-            event = self._AQS.aq.event(rawEvent["payload"])
-            if event.topic == 'item.updated.Project':
-                projects.updated(self, event)
-            elif event.topic == 'item.created.Asset':
-                assets.created(self, event)
-            elif event.topic == 'item.updated.Asset':
-                assets.updated(self, event)
-            elif event.topic == 'item.created.Shot':
-                shots.created(self, event)
-            elif event.topic == 'item.updated.Shot':
-                shots.updated(self, event)
-            elif event.topic == 'item.created.Sequence':
-                sequences.created(self, event)
-            elif event.topic == 'item.updated.Sequence':
-                sequences.updated(self, event)
-            elif event.topic == 'item.created.Episode':
-                episodes.created(self, event)
-            elif event.topic == 'item.updated.Episode':
-                episodes.updated(self, event)
-            elif event.topic == 'item.created.Task':
-                tasks.created(self, event)
-            elif event.topic == 'item.updated.Task':
-                tasks.updated(self, event)
-            elif event.topic == 'user.assigned' or event.topic == 'user.unassigned':
-                tasks.assigned(self, event)
+            payload = rawEvent["payload"]
+            # Compressed payloads keep their topic, so unknown topics are skipped before decoding
+            topic_handlers = registry.match(payload.get("topic"))
+            if not topic_handlers:
+                log.debug(f"No handler for Aquarium event {payload.get('topic')}, skipped")
+                return
+
+            # Compact payloads only hold item keys, handlers read the items they need from Aquarium
+            event = self._AQS.aq.event(expand_payload(payload))
+            for topic_handler in topic_handlers:
+                topic_handler(self, event)
 
     def set_job_processing(self, job):
-        event_id = job["id"]
-        source_id = job["dependsOn"]
-        source_event = get_event(event_id)
-
-        description = f"Processing {source_event['description']}"
-
-        update_event(
-            event_id,
-            sender=get_service_addon_name(),
-            status="in_progress",
-            description=description,
-        )
+        description = self._descriptions.get(job["id"], "")
+        self.statuses.set(job["id"], "in_progress", f"Processing {description}")
 
     def set_job_finished(self, job):
-        event_id = job["id"]
-        source_id = job["dependsOn"]
-        source_event = get_event(event_id)
-        description = f"Processed {source_event['description']}"
-
-        update_event(
-            event_id,
-            sender=get_service_addon_name(),
-            status="finished",
-            description=description,
+        description = self._descriptions.pop(job["id"], "")
+        # Jobs enrolled sequentially block the next enrollment until they are finished
+        self.statuses.set(job["id"], "finished", f"Processed {description}", urgent=self.workers == 1)
+
+    def set_job_superseded(self, job, newer_job):
+        self.superseded += 1
+        self.statuses.set(
+            job["id"],
+            "finished",
+            f"Superseded by {newer_job['dependsOn']}, a newer event of the same item",
         )
 
-    def get_paired_ayon_project(self, aq_project_key: str, retry=True):
-        """Get the Ayon project name if paired"""
-
-        for pair in self.pairing_list:
-            if pair["aquariumProjectKey"] == aq_project_key:
-                return pair["ayonProjectName"]
+    def set_job_failed(self, job):
+        self._descriptions.pop(job["id"], None)
+        self.statuses.set(job["id"], "failed", urgent=self.workers == 1)
 
-        if retry:
-            self.pairing_list = self.get_pairing_list()
-            return self.get_paired_ayon_project(aq_project_key, False)
-
-    def get_pairing_list(self):
-        """Get the list of paired projects between Aquarium and Ayon"""
-        res = get(f"{self.entrypoint}/projects/pair")
-        return res.data
+    def get_paired_ayon_project(self, aq_project_key: str):
+        """Get the Ayon project name if paired"""
+        return self.pairing.get(aq_project_key)
 
     def stop(self):
         self.processing = False
+        # Queued jobs are processed before stopping, prefetched ones are failed to be enrolled again
+        self.dispatcher.stop()
+        while True:
+            try:
+                item = self._events_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple) and item[1] is not None:
+                self.set_job_failed(item[1])
+        self.statuses.stop()
 
 
 def main():
@@ -0,0 +1,165 @@
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set
+
+import ayon_api
+
+log = logging.getLogger(__name__)
+
+# AYON events of users changes, `*` is a wildcard
+USER_TOPICS = ("entity.user.*",)
+# Seconds of users events read again on start
+EVENTS_MARGIN = 60
+
+
+class UserDirectory:
+    """
+    Map AYON users and Aquarium users by their email address.
+
+    AYON users are indexed by lower case email, and reloaded every `ttl` seconds, or
+    when AYON `entity.user.*` events are found, checked every `events_interval` seconds.
+    An unknown email triggers a reload at most once per `events_interval`, and is then
+    known as unknown until the next reload, so external or deleted users don't reload it.
+
+    Aquarium user keys are resolved on demand and cached, for the AYON -> Aquarium
+    direction (assignees sync from AYON).
+    """
+
+    def __init__(self, aq=None, ttl: float = 3600, events_interval: float = 10):
+        self.aq = aq
+        self.ttl = ttl
+        self.events_interval = events_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.unknown_hits = 0
+        self.reloads = 0
+        self.updates = 0
+
+        self._names: Dict[str, str] = {}
+        self._emails: Dict[str, str] = {}
+        self._aquarium_keys: Dict[str, str] = {}
+        # Lower case emails of no AYON user, until the next reload
+        self._unknown: Set[str] = set()
+        self._loaded_at = 0.0
+        self._polled_at = 0.0
+        self._events_since: Optional[str] = None
+        self._lock = threading.RLock()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._names),
+            "aquariumUsers": len(self._aquarium_keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "unknown": len(self._unknown),
+            "unknownHits": self.unknown_hits,
+            "reloads": self.reloads,
+            "updates": self.updates,
+        }
+
+    def reload(self):
+        """Load all AYON users."""
+        users = list(ayon_api.get_users())
+        with self._lock:
+            self._names = {}
+            self._emails = {}
+            self._unknown = set()
+            for user in users:
+                self._index(user)
+            self._loaded_at = time.time()
+            self.reloads += 1
+
+    def _index(self, user: dict):
+        email = (user.get("attrib") or {}).get("email")
+        if not email:
+            return
+        self._names[email.lower()] = user["name"]
+        self._emails[user["name"]] = email.lower()
+
+    def refresh(self):
+        """Reload the users when expired, or when they changed since the last check."""
+        now = time.time()
+        if now - self._loaded_at <= self.ttl and now - self._polled_at <= self.events_interval:
+            return
+
+        # Workers wait for a single reload
+        with self._lock:
+            if time.time() - self._loaded_at > self.ttl:
+                self.reload()
+                self._polled_at = time.time()
+            elif time.time() - self._polled_at > self.events_interval:
+                self._polled_at = time.time()
+                self.poll_events()
+
+    def poll_events(self):
+        """Reload the users when AYON users changed since the last poll."""
+        if self._events_since is None:
+            # Margin for a clock difference with AYON server, a change seen twice only reloads twice
+            since = datetime.now(timezone.utc) - timedelta(seconds=EVENTS_MARGIN)
+            self._events_since = since.isoformat()
+
+        events = list(ayon_api.get_events(
+            topics=USER_TOPICS,
+            newer_than=self._events_since,
+            fields={"id", "topic", "createdAt"},
+        ))
+        if not events:
+            return
+
+        self._events_since = max(event["createdAt"] for event in events)
+        self.updates += len(events)
+        log.info(f"{len(events)} AYON users changes, reload users")
+        self.reload()
+
+    def get_name(self, email: str) -> Optional[str]:
+        """AYON user name of an email address, case insensitive."""
+        if not email:
+            return None
+
+        self.refresh()
+        email = email.lower()
+        name = self._names.get(email)
+        if name is not None:
+            self.hits += 1
+            return name
+
+        if email in self._unknown:
+            self.unknown_hits += 1
+            return None
+
+        self.misses += 1
+        with self._lock:
+            if time.time() - self._loaded_at > self.events_interval:
+                self.reload()
+            name = self._names.get(email)
+            if name is None:
+                self._unknown.add(email)
+        return name
+
+    def get_email(self, name: str) -> Optional[str]:
+        """Email address of an AYON user."""
+        self.refresh()
+        return self._emails.get(name)
+
+    def get_aquarium_key(self, name: str) -> Optional[str]:
+        """Aquarium user key of an AYON user, matched by email."""
+        email = self.get_email(name)
+        if not email or self.aq is None:
+            return None
+
+        key = self._aquarium_keys.get(email)
+        if key is not None:
+            return key
+
+        keys = self.aq.query(
+            meshql="# 0,1 $User AND LOWER(item.data.email) == @email VIEW item._key",
+            aliases={"email": email},
+        )
+        if keys:
+            with self._lock:
+                self._aquarium_keys[email] = keys[0]
+            return keys[0]
+        return None